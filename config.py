@@ -2,16 +2,32 @@
 # Configuration Settings for MindMap Pro
 
 import os
+from enum import Enum
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (한 프로세스 트리에서 .env는 한 번만 읽음)
+if not os.getenv("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
+
+class Environment(Enum):
+    DEVELOPMENT = "development"
+    PRODUCTION = "production"
+    TESTING = "testing"
+
+    @classmethod
+    def parse(cls, value: str) -> "Environment":
+        try:
+            return cls(value.strip().lower())
+        except ValueError:
+            return cls.DEVELOPMENT
 
 class Config:
     # Application Settings
     APP_NAME = "MindMap Pro"
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+    ENV = Environment.parse(ENVIRONMENT)
 
     # Database Settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///mindmap_pro.db")
@@ -26,13 +42,22 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-development")
     JWT_EXPIRATION = int(os.getenv("JWT_EXPIRATION", 3600))  # 1 hour
     REFRESH_TOKEN_EXPIRATION = int(os.getenv("REFRESH_TOKEN_EXPIRATION", 2592000))  # 30 days
+    # 테스트 모드에서는 bcrypt 최소 비용 사용 (운영 환경에서는 무시)
+    TEST_MODE = (os.getenv("MINDMAP_TEST_MODE", "False").lower() == "true"
+                 and ENV is not Environment.PRODUCTION)
+    BCRYPT_ROUNDS = int(os.getenv(
+        "BCRYPT_ROUNDS",
+        4 if TEST_MODE else 10 if ENV is Environment.DEVELOPMENT else 12
+    ))
     
     # Cache Settings
     CACHE_TYPE = os.getenv("CACHE_TYPE", "redis")
     CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", 300))
+    CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 128))  # in-process cache entries
     
     # API Rate Limiting
     RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", 60))
+    LOGIN_RATE_LIMIT_PER_MINUTE = int(os.getenv("LOGIN_RATE_LIMIT_PER_MINUTE", 5))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -44,12 +69,12 @@ class Config:
 
     @staticmethod
     def is_production():
-        return Config.ENVIRONMENT == "production"
+        return Config.ENV is Environment.PRODUCTION
 
     @staticmethod
     def is_development():
-        return Config.ENVIRONMENT == "development"
+        return Config.ENV is Environment.DEVELOPMENT
 
     @staticmethod
     def is_testing():
-        return Config.ENVIRONMENT == "testing"
+        return Config.ENV is Environment.TESTING
@@ -3,15 +3,40 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from datetime import datetime, timedelta
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+
+def _stress_score_stats(stress: np.ndarray, score: np.ndarray) -> Tuple[float, float]:
+    """스트레스-성적 상관계수와 점수/스트레스 비율이 가장 높은 스트레스 수준"""
+    valid = ~(np.isnan(stress) | np.isnan(score))
+    stress, score = stress[valid], score[valid]
+    if len(stress) == 0:
+        return float('nan'), 3.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = float(np.corrcoef(stress, score)[0, 1]) if len(stress) > 1 else float('nan')
+        ratio = score / stress
+
+    if np.isnan(ratio).all():
+        return correlation, 3.0
+    return correlation, float(stress[np.nanargmax(ratio)])
+
+# 학습 통계 중 정수형 컬럼 (가능한 가장 작은 정수형으로 변환)
+_INT_STAT_COLUMNS = ['study_sessions', 'total_time']
+
+def _stats_frame(stats: List[Dict]) -> pd.DataFrame:
+    """학습 통계 목록을 좁은 dtype(정수 다운캐스트, 과목 category)의 DataFrame으로 변환"""
+    df = pd.DataFrame(stats)
+    int_cols = [c for c in _INT_STAT_COLUMNS if c in df.columns]
+    if int_cols:
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast='integer')
+    if 'subject' in df.columns:
+        df['subject'] = df['subject'].astype('category')
+    return df
 
 class LearningAnalyzer:
     def __init__(self, db_manager):
         self.db = db_manager
-        self.scaler = StandardScaler()
 
     def analyze_study_patterns(self, user_id: int, days: int = 30) -> Dict[str, Any]:
         """학습 패턴 종합 분석"""
@@ -35,7 +60,7 @@ class LearningAnalyzer:
         if not stats:
             return {}
             
-        df = pd.DataFrame(stats)
+        df = _stats_frame(stats)
         patterns = {
             'most_studied': df.loc[df['total_time'].idxmax()]['subject'],
             'most_efficient': df.loc[df['avg_score'].idxmax()]['subject'],
@@ -47,37 +72,35 @@ class LearningAnalyzer:
 
     def _analyze_stress_factors(self, df: pd.DataFrame) -> Dict[str, Any]:
         """스트레스 요인 분석"""
-        stress_correlation = df['avg_stress'].corr(df['avg_score'])
-        high_stress_subjects = df[df['avg_stress'] > df['avg_stress'].mean()]['subject'].tolist()
+        stress = df['avg_stress'].to_numpy(np.float64)
+        stress_correlation, optimal_stress = _stress_score_stats(
+            stress, df['avg_score'].to_numpy(np.float64)
+        )
+        high_stress_subjects = df.loc[stress > np.nanmean(stress), 'subject'].tolist()
         
         return {
             'stress_impact': stress_correlation,
             'high_stress_subjects': high_stress_subjects,
-            'optimal_stress_level': self._find_optimal_stress_level(df)
+            'optimal_stress_level': optimal_stress
         }
 
     def _find_optimal_session_length(self, df: pd.DataFrame) -> int:
         """최적 학습 세션 길이 분석"""
         if 'avg_time' in df.columns and 'avg_score' in df.columns:
-            scores = df['avg_score'].values.reshape(-1, 1)
-            times = df['avg_time'].values.reshape(-1, 1)
-            
-            if len(scores) > 1:
-                kmeans = KMeans(n_clusters=2, random_state=42)
-                kmeans.fit(np.column_stack((times, scores)))
-                
-                cluster_centers = kmeans.cluster_centers_
-                optimal_cluster = cluster_centers[cluster_centers[:, 1].argmax()]
-                
-                return int(optimal_cluster[0])
+            if len(df) > 1:
+                # 성적 상위 그룹(중앙값 이상)의 평균 학습 시간
+                threshold = df['avg_score'].median()
+                return int(df.loc[df['avg_score'] >= threshold, 'avg_time'].mean())
                 
         return 45  # 기본값으로 45분 반환
 
     def _find_optimal_stress_level(self, df: pd.DataFrame) -> float:
         """최적 스트레스 수준 분석"""
         if 'avg_stress' in df.columns and 'avg_score' in df.columns:
-            stress_score_ratio = df['avg_score'] / df['avg_stress']
-            return float(df.loc[stress_score_ratio.idxmax()]['avg_stress'])
+            return _stress_score_stats(
+                df['avg_stress'].to_numpy(np.float64),
+                df['avg_score'].to_numpy(np.float64)
+            )[1]
         return 3.0  # 기본값으로 3.0 반환
 
     def _generate_recommendations(self, patterns: Dict, efficiency: List[Dict]) -> List[str]:
@@ -120,10 +143,10 @@ class LearningAnalyzer:
                 'factors': []
             }
             
-        df = pd.DataFrame(recent_stats)
-        subject_data = df[df['subject'] == subject]
+        df = _stats_frame(recent_stats)
+        matches = np.flatnonzero(df['subject'].to_numpy() == subject)
         
-        if subject_data.empty:
+        if len(matches) == 0:
             return {
                 'predicted_score': None,
                 'confidence': 0,
@@ -131,14 +154,14 @@ class LearningAnalyzer:
             }
             
         # 간단한 선형 예측 모델
-        current_score = float(subject_data['avg_score'].iloc[0])
-        study_intensity = float(subject_data['total_time'].iloc[0])
-        stress_level = float(subject_data['avg_stress'].iloc[0])
+        values = df[['avg_score', 'total_time', 'avg_stress']].to_numpy(dtype=np.float64)
+        current_score, study_intensity, stress_level = (float(v) for v in values[matches[0]])
+        time_mean, stress_mean = (float(v) for v in np.nanmean(values[:, 1:], axis=0))
         
-        predicted_score = current_score * (1 + 0.1 * (study_intensity / df['total_time'].mean()))
-        predicted_score *= (1 - 0.05 * (stress_level / df['avg_stress'].mean()))
+        predicted_score = current_score * (1 + 0.1 * (study_intensity / time_mean))
+        predicted_score *= (1 - 0.05 * (stress_level / stress_mean))
         
-        confidence = min(0.9, 0.5 + 0.1 * (study_intensity / df['total_time'].mean()))
+        confidence = min(0.9, 0.5 + 0.1 * (study_intensity / time_mean))
         
         return {
             'predicted_score': round(predicted_score, 2),
@@ -1,43 +1,118 @@
+import numpy as np
 import pandas as pd
 import networkx as nx
+from scipy import sparse
+from collections import OrderedDict
 from typing import Dict, List, Any
+from config import Config
+
+class KnowledgeGraph:
+    """CSR 인접 행렬 기반 지식맵 그래프"""
+
+    def __init__(self, nodes: pd.DataFrame, edges: pd.DataFrame, adjacency: sparse.csr_matrix):
+        self.nodes = nodes            # index: 노드 ID, columns: subject/concept/level
+        self.edges = edges            # source/target: 노드 위치(int32), weight, relationship
+        self.adjacency = adjacency    # 대칭 가중치 인접 행렬
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def neighbors(self, node_id: Any) -> List[Any]:
+        """인접 노드 ID 목록"""
+        i = self.nodes.index.get_loc(node_id)
+        row = self.adjacency.indices[self.adjacency.indptr[i]:self.adjacency.indptr[i + 1]]
+        return self.nodes.index[row].tolist()
+
+    def to_networkx(self) -> nx.Graph:
+        """기존 호출부 호환용 NetworkX 그래프 변환"""
+        G = nx.Graph()
+        G.add_nodes_from(
+            (node_id, attrs) for node_id, attrs in self.nodes.to_dict('index').items()
+        )
+        node_ids = self.nodes.index
+        G.add_edges_from(
+            zip(
+                node_ids[self.edges['source'].to_numpy()],
+                node_ids[self.edges['target'].to_numpy()],
+                (
+                    {'weight': weight, 'relationship': relationship}
+                    for weight, relationship in zip(
+                        self.edges['weight'].tolist(), self.edges['relationship'].tolist()
+                    )
+                )
+            )
+        )
+        return G
 
 class DataProcessor:
-    def __init__(self):
-        self.data_cache = {}
+    def __init__(self, cache_maxsize: int = None):
+        self.data_cache: OrderedDict = OrderedDict()
+        self.cache_maxsize = cache_maxsize or Config.CACHE_MAXSIZE
 
-    def process_knowledge_map_data(self, nodes: List[Dict], edges: List[Dict]) -> nx.Graph:
+    def process_knowledge_map_data(self, nodes: List[Dict], edges: List[Dict]) -> KnowledgeGraph:
         """
-        지식맵 데이터를 처리하여 NetworkX 그래프로 변환
+        지식맵 데이터를 처리하여 CSR 기반 그래프로 변환
         
         Args:
             nodes: 노드 정보 리스트
             edges: 엣지 정보 리스트
             
         Returns:
-            nx.Graph: 처리된 지식맵 그래프
+            KnowledgeGraph: 처리된 지식맵 그래프 (to_networkx()로 NetworkX 변환 가능)
         """
-        G = nx.Graph()
+        node_frame = pd.DataFrame(
+            [
+                (node['id'], node.get('subject', ''), node.get('concept', ''), node.get('level', 1))
+                for node in nodes
+            ],
+            columns=['id', 'subject', 'concept', 'level']
+        ).drop_duplicates('id', keep='last')
         
-        # 노드 추가
-        for node in nodes:
-            G.add_node(
-                node['id'],
-                subject=node.get('subject', ''),
-                concept=node.get('concept', ''),
-                level=node.get('level', 1)
-            )
-            
-        # 엣지 추가
-        for edge in edges:
-            G.add_edge(
-                edge['source'],
-                edge['target'],
-                weight=edge.get('weight', 1),
-                relationship=edge.get('relationship', '')
-            )
+        edge_frame = pd.DataFrame(
+            [
+                (edge['source'], edge['target'], edge.get('weight', 1), edge.get('relationship', ''))
+                for edge in edges
+            ],
+            columns=['source', 'target', 'weight', 'relationship']
+        )
+        
+        # 노드 목록에 없는 엣지 끝점은 기본 속성으로 추가
+        known = set(node_frame['id'])
+        missing = [
+            node_id for node_id in pd.unique(edge_frame[['source', 'target']].to_numpy().ravel())
+            if node_id not in known
+        ]
+        if missing:
+            node_frame = pd.concat([
+                node_frame,
+                pd.DataFrame({'id': missing, 'subject': '', 'concept': '', 'level': 1})
+            ], ignore_index=True)
+        
+        node_frame = node_frame.set_index('id').astype({'subject': 'category', 'concept': 'category'})
+        n = len(node_frame)
+        
+        # 노드 ID를 행렬 위치로 변환
+        row = node_frame.index.get_indexer(edge_frame['source']).astype(np.int32)
+        col = node_frame.index.get_indexer(edge_frame['target']).astype(np.int32)
+        
+        # 무방향 중복 엣지는 마지막 값만 유지
+        pair = np.minimum(row, col).astype(np.int64) * n + np.maximum(row, col)
+        keep = ~pd.Series(pair).duplicated(keep='last').to_numpy()
+        row, col = row[keep], col[keep]
+        
+        edge_frame = pd.DataFrame({
+            'source': row,
+            'target': col,
+            'weight': edge_frame['weight'].to_numpy(dtype=np.float32)[keep],
+            'relationship': pd.Categorical(edge_frame['relationship'].to_numpy()[keep])
+        })
+        
+        adjacency = sparse.csr_matrix(
+            (edge_frame['weight'].to_numpy(), (row, col)), shape=(n, n)
+        )
+        adjacency = (adjacency + adjacency.T - sparse.diags(adjacency.diagonal())).tocsr()
             
-        return G
+        return KnowledgeGraph(node_frame, edge_frame, adjacency)
 
     def analyze_learning_patterns(self, study_data: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -52,9 +127,10 @@ class DataProcessor:
         if study_data.empty:
             return {}
             
+        study_data = study_data.astype({'subject': 'category'})
         analysis = {
             'total_study_time': study_data['duration'].sum(),
-            'subject_distribution': study_data.groupby('subject')['duration'].sum().to_dict(),
+            'subject_distribution': study_data.groupby('subject', observed=True)['duration'].sum().to_dict(),
             'peak_performance_time': self._find_peak_performance_time(study_data),
             'weak_points': self._identify_weak_points(study_data)
         }
@@ -68,12 +144,23 @@ class DataProcessor:
         if 'score' not in data.columns or 'time' not in data.columns:
             return {}
             
-        performance_by_time = data.groupby('time')['score'].mean()
-        peak_time = performance_by_time.idxmax()
+        # 시간대를 정수 코드로 바꿔 bincount 한 번으로 평균 계산
+        times = data['time'].astype('category')
+        codes = times.cat.codes.to_numpy()
+        scores = data['score'].to_numpy(dtype=np.float64)
+        valid = (codes >= 0) & ~np.isnan(scores)
+        if not valid.any():
+            return {}
+            
+        n_times = len(times.cat.categories)
+        sums = np.bincount(codes[valid], weights=scores[valid], minlength=n_times)
+        counts = np.bincount(codes[valid], minlength=n_times)
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), -np.inf)
+        best = int(means.argmax())
         
         return {
-            'peak_time': peak_time,
-            'average_score': performance_by_time[peak_time]
+            'peak_time': times.cat.categories[best],
+            'average_score': float(means[best])
         }
 
     def _identify_weak_points(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
@@ -83,25 +170,36 @@ class DataProcessor:
         if 'score' not in data.columns or 'concept' not in data.columns:
             return []
             
-        weak_points = data[data['score'] < data['score'].mean()]
+        weak_points = (
+            data.loc[data['score'] < data['score'].mean()]
+            .astype({'concept': 'category'})
+            .groupby('concept', sort=False, observed=True)['score']
+            .agg(average_score='mean', frequency='size')
+            .reset_index()
+        )
         
-        return [
-            {
-                'concept': concept,
-                'average_score': scores['score'].mean(),
-                'frequency': len(scores)
-            }
-            for concept, scores in weak_points.groupby('concept')
-        ]
+        return weak_points.to_dict('records')
 
     def cache_data(self, key: str, data: Any) -> None:
         """
-        데이터 캐싱
+        데이터 캐싱 (최대 개수를 넘으면 가장 오래 사용하지 않은 항목 제거)
         """
         self.data_cache[key] = data
+        self.data_cache.move_to_end(key)
+        while len(self.data_cache) > self.cache_maxsize:
+            self.data_cache.popitem(last=False)
 
     def get_cached_data(self, key: str) -> Any:
         """
         캐시된 데이터 조회
         """
-        return self.data_cache.get(key)
+        if key not in self.data_cache:
+            return None
+        self.data_cache.move_to_end(key)
+        return self.data_cache[key]
+
+    def clear_cache(self) -> None:
+        """
+        캐시 전체 삭제
+        """
+        self.data_cache.clear()
@@ -4,7 +4,7 @@
 import streamlit as st
 import pandas as pd
 import networkx as nx
-from modules.auth import check_authentication
+from modules.auth import check_authentication, RateLimitExceeded
 from modules.knowledge_map import KnowledgeMap
 from modules.learning_analysis import LearningAnalysis
 from core.processor import DataProcessor
@@ -39,7 +39,12 @@ def main():
                 submit = st.form_submit_button("로그인")
                 
                 if submit:
-                    if check_authentication(username, password):
+                    try:
+                        authenticated = check_authentication(username, password)
+                    except RateLimitExceeded:
+                        st.error("로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.")
+                        authenticated = False
+                    if authenticated:
                         st.session_state.authenticated = True
                         st.session_state.current_user = username
                         st.success("로그인 성공!")
@@ -57,6 +62,7 @@ def main():
         
         with tabs[0]:
             st.header("지식맵")
+            # 그래프는 세션 상태에 보관되므로 매 실행마다 새로 만들어도 유지됨
             knowledge_map = KnowledgeMap()
             knowledge_map.render()
             
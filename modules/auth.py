@@ -1,27 +1,74 @@
 # File: modules/auth_manager.py
 # Authentication Management System for MindMap Pro
 
+import re
 import jwt
+import time
 import bcrypt
+import hmac
+import hashlib
 import secrets
+import string
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
+from config import Config
 from storage.database import DatabaseManager
+from storage.cache_manager import CacheManager
+
+# 디코딩된 토큰 페이로드 캐시 최대 크기 / 유지 시간(초)
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL = 30
+
+# JWT 서명 알고리즘 (decode에 넘길 허용 목록도 한 번만 생성)
+JWT_ALGORITHM = 'HS256'
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+SPECIAL_CHARACTERS = "!@#$%^&*(),.?\":{}|<>"
+# 비밀번호 문자 종류: ASCII 비밀번호용 바이트 집합(bytes.translate로 C 수준 검사)과
+# 비ASCII 비밀번호용 유니코드 판별 함수 (예: 'Ä'는 대문자, 'ü'는 소문자로 인정)
+_PASSWORD_CHAR_CLASSES = (
+    (string.ascii_uppercase.encode(), str.isupper, "비밀번호는 최소 하나의 대문자를 포함해야 합니다."),
+    (string.ascii_lowercase.encode(), str.islower, "비밀번호는 최소 하나의 소문자를 포함해야 합니다."),
+    (string.digits.encode(), str.isdigit, "비밀번호는 최소 하나의 숫자를 포함해야 합니다."),
+    (SPECIAL_CHARACTERS.encode(), SPECIAL_CHARACTERS.__contains__,
+     "비밀번호는 최소 하나의 특수문자를 포함해야 합니다."),
+)
+# 사용자명에 포함되면 거부하는 XSS/SQL 인젝션 패턴 (모듈 로드 시 한 번 컴파일)
+_BAD_INPUT_RE = re.compile(
+    r"<\s*/?\s*script|\bon\w+\s*=|javascript:|['\"]\s*(?:or|and)\b|--",
+    re.IGNORECASE
+)
+
+class RateLimitExceeded(Exception):
+    """요청 횟수 제한 초과"""
 
 class AuthManager:
-    def __init__(self, db_manager: DatabaseManager, secret_key: str = None):
+    def __init__(self, db_manager: DatabaseManager, secret_key: str = None,
+                 bcrypt_rounds: int = None, cache_manager: CacheManager = None):
         self.db = db_manager
+        self.cache = cache_manager
+        self.login_rate_limit = Config.LOGIN_RATE_LIMIT_PER_MINUTE
         self.secret_key = secret_key or secrets.token_hex(32)
         self.token_expiry = timedelta(hours=24)
         self.refresh_token_expiry = timedelta(days=30)
+        self.bcrypt_rounds = bcrypt_rounds or Config.BCRYPT_ROUNDS
+        self._token_cache: OrderedDict = OrderedDict()
+        # Streamlit 스크립트 스레드가 AuthManager를 공유하므로 캐시 변경은 잠금 하에서 수행
+        self._token_cache_lock = threading.Lock()
+        # 필수 클레임 옵션을 미리 설정한 JWT 인코더/디코더 재사용
+        self._jwt = jwt.PyJWT(options={'require': ['exp', 'user_id', 'type']})
+        # 존재하지 않는 사용자도 동일한 비용으로 검증하기 위한 더미 해시
+        self._dummy_hash = self.hash_password(secrets.token_urlsafe(16))
 
     def hash_password(self, password: str) -> str:
         """비밀번호 해싱"""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     def verify_password(self, password: str, hashed_password: str) -> bool:
-        """비밀번호 검증"""
+        """비밀번호 검증 (bcrypt.checkpw는 상수 시간 비교)"""
         try:
             return bcrypt.checkpw(
                 password.encode('utf-8'),
@@ -39,10 +86,10 @@ class AuthManager:
             'exp': datetime.utcnow() + self.token_expiry,
             'type': 'access'
         }
-        access_token = jwt.encode(
+        access_token = self._jwt.encode(
             access_token_payload,
             self.secret_key,
-            algorithm='HS256'
+            algorithm=JWT_ALGORITHM
         )
 
         # 리프레시 토큰 생성
@@ -51,24 +98,46 @@ class AuthManager:
             'exp': datetime.utcnow() + self.refresh_token_expiry,
             'type': 'refresh'
         }
-        refresh_token = jwt.encode(
+        refresh_token = self._jwt.encode(
             refresh_token_payload,
             self.secret_key,
-            algorithm='HS256'
+            algorithm=JWT_ALGORITHM
         )
 
         return access_token, refresh_token
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """토큰 검증"""
+        token_bytes = token.encode('utf-8')
+        token_hash = hashlib.blake2b(token_bytes, digest_size=16).digest()
+
+        # 캐시 유지 시간(최대 토큰 만료 시각) 동안은 이전에 검증한 페이로드 재사용
+        # (다이제스트 충돌 대비 원본 토큰도 상수 시간 비교)
+        now = time.time()
+        with self._token_cache_lock:
+            cached = self._token_cache.get(token_hash)
+            if cached is not None:
+                payload, cached_until, cached_token = cached
+                if cached_until > now and hmac.compare_digest(cached_token, token_bytes):
+                    self._token_cache.move_to_end(token_hash)
+                    return dict(payload)
+                self._token_cache.pop(token_hash, None)
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
-            return payload
+            payload = self._jwt.decode(token, self.secret_key, algorithms=_JWT_ALGORITHMS)
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
 
+        with self._token_cache_lock:
+            self._token_cache[token_hash] = (
+                payload, min(payload['exp'], now + TOKEN_CACHE_TTL), token_bytes
+            )
+            if len(self._token_cache) > TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+        return dict(payload)
+
     def refresh_access_token(self, refresh_token: str) -> Optional[str]:
         """리프레시 토큰을 사용하여 새로운 액세스 토큰 발급"""
         payload = self.verify_token(refresh_token)
@@ -87,19 +156,39 @@ class AuthManager:
             'exp': datetime.utcnow() + self.token_expiry,
             'type': 'access'
         }
-        return jwt.encode(
+        return self._jwt.encode(
             access_token_payload,
             self.secret_key,
-            algorithm='HS256'
+            algorithm=JWT_ALGORITHM
         )
 
-    def login(self, username: str, password: str) -> Optional[Dict]:
-        """사용자 로그인"""
-        user = self.db.get_user(username)
-        if not user:
+    def login(self, username: str, password: str,
+              ip_address: str = None) -> Optional[Dict]:
+        """사용자 로그인 (캐시와 ip_address가 있으면 IP당 분당 실패 횟수 제한, 초과 시 RateLimitExceeded 발생)"""
+        # 실패 횟수만 세고 사용자명 단독으로는 키를 만들지 않음
+        # (성공한 로그인은 한도를 소모하지 않고, 타인이 특정 계정을 잠글 수 없음)
+        limited = self.cache is not None and bool(ip_address)
+
+        # 제한 초과 시 DB 조회와 bcrypt 검증 전에 거부
+        # 카운터를 사용할 수 없으면(None) 로그인은 허용하고 장애는 CacheManager가 로그로 남김
+        if limited:
+            failures = self.cache.get_rate_limit("login", ip_address)
+            if failures is not None and failures >= self.login_rate_limit:
+                raise RateLimitExceeded("Rate limit exceeded for login attempts")
+
+        if _BAD_INPUT_RE.search(username):
+            if limited:
+                self.cache.hit_rate_limit("login", ip_address)
             return None
 
-        if not self.verify_password(password, user['password_hash']):
+        user = self.db.get_user(username)
+
+        # 사용자 존재 여부와 관계없이 bcrypt 검증을 한 번 수행 (타이밍 차이 제거)
+        hashed_password = user['password_hash'] if user else self._dummy_hash
+        password_ok = self.verify_password(password, hashed_password)
+        if not user or not password_ok:
+            if limited:
+                self.cache.hit_rate_limit("login", ip_address)
             return None
 
         # 토큰 생성
@@ -120,6 +209,14 @@ class AuthManager:
 
     def register(self, username: str, password: str) -> Optional[Dict]:
         """새로운 사용자 등록"""
+        if _BAD_INPUT_RE.search(username):
+            return None
+
+        # 약한 비밀번호는 bcrypt 해싱 전에 거부
+        is_valid, _ = self.validate_password_strength(password)
+        if not is_valid:
+            return None
+
         # 사용자명 중복 확인
         existing_user = self.db.get_user(username)
         if existing_user:
@@ -140,22 +237,21 @@ class AuthManager:
         }
 
     def validate_password_strength(self, password: str) -> Tuple[bool, str]:
-        """비밀번호 강도 검증"""
+        """비밀번호 강도 검증 (가장 싼 길이 검사부터 수행)"""
         if len(password) < 8:
             return False, "비밀번호는 최소 8자 이상이어야 합니다."
-            
-        if not any(c.isupper() for c in password):
-            return False, "비밀번호는 최소 하나의 대문자를 포함해야 합니다."
-            
-        if not any(c.islower() for c in password):
-            return False, "비밀번호는 최소 하나의 소문자를 포함해야 합니다."
-            
-        if not any(c.isdigit() for c in password):
-            return False, "비밀번호는 최소 하나의 숫자를 포함해야 합니다."
-            
-        if not any(c in "!@#$%^&*(),.?\":{}|<>" for c in password):
-            return False, "비밀번호는 최소 하나의 특수문자를 포함해야 합니다."
-            
+
+        if password.isascii():
+            # 해당 문자들을 지웠을 때 길이가 그대로면 그 종류의 문자가 없음
+            encoded = password.encode('ascii')
+            for chars, _, message in _PASSWORD_CHAR_CLASSES:
+                if len(encoded.translate(None, chars)) == len(encoded):
+                    return False, message
+        else:
+            for _, has_class, message in _PASSWORD_CHAR_CLASSES:
+                if not any(map(has_class, password)):
+                    return False, message
+
         return True, "유효한 비밀번호입니다."
 
     def change_password(self, user_id: int, old_password: str,
@@ -1,15 +1,21 @@
 import streamlit as st
 import networkx as nx
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from core.processor import DataProcessor
 from core.visualizer import Visualizer
 
+# 이 개수를 넘는 지식맵은 Barnes-Hut 근사 레이아웃 사용
+LARGE_MAP_THRESHOLD = 50
+
 class KnowledgeMap:
     def __init__(self):
         self.processor = DataProcessor()
         self.visualizer = Visualizer()
-        self.G = nx.Graph()
+        # 재실행 시에도 그래프가 유지되도록 세션 상태에 보관
+        if 'knowledge_map_graph' not in st.session_state:
+            st.session_state['knowledge_map_graph'] = nx.Graph()
+        self.G = st.session_state['knowledge_map_graph']
 
     def create_new_map(self):
         st.subheader("새로운 지식맵 만들기")
@@ -44,11 +50,37 @@ class KnowledgeMap:
             4. '개념 추가' 버튼을 클릭하세요
             """)
 
+    def compute_layout(self):
+        """노드 위치 계산 (그래프가 바뀌지 않으면 세션에 저장된 위치 재사용)"""
+        layout_key = hash((tuple(self.G.nodes()), tuple(self.G.edges())))
+        cached = st.session_state.get('knowledge_map_layout')
+        if cached and cached[0] == layout_key:
+            return cached[1]
+
+        pos = None
+        if len(self.G) > LARGE_MAP_THRESHOLD:
+            try:
+                from fa2_modified import ForceAtlas2
+            except ImportError:
+                ForceAtlas2 = None
+
+            if ForceAtlas2 is not None:
+                forceatlas2 = ForceAtlas2(barnesHutOptimize=True, verbose=False)
+                pos = forceatlas2.forceatlas2_networkx_layout(self.G, iterations=100)
+
+        if pos is None:
+            pos = nx.spring_layout(self.G)
+
+        st.session_state['knowledge_map_layout'] = (layout_key, pos)
+        return pos
+
     def visualize_map(self):
         if not self.G.nodes():
             st.warning("아직 추가된 개념이 없습니다. 새로운 개념을 추가해주세요.")
             return
 
+        import plotly.graph_objects as go
+
         # 노드 색상 설정
         color_map = {
             "수학": "#FF6B6B",
@@ -61,24 +93,32 @@ class KnowledgeMap:
         }
 
         # 노드 위치 계산
-        pos = nx.spring_layout(self.G)
+        pos = self.compute_layout()
         
+        # 좌표 배열 구성 (엣지 사이는 NaN으로 선을 끊음)
+        nodes = list(self.G.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        coords = np.array([pos[node] for node in nodes], dtype=float)
+
+        edges = list(self.G.edges())
+        src = np.fromiter((node_index[u] for u, _ in edges), dtype=int, count=len(edges))
+        dst = np.fromiter((node_index[v] for _, v in edges), dtype=int, count=len(edges))
+
+        edge_x = np.full(3 * len(edges), np.nan)
+        edge_y = np.full(3 * len(edges), np.nan)
+        edge_x[0::3], edge_x[1::3] = coords[src, 0], coords[dst, 0]
+        edge_y[0::3], edge_y[1::3] = coords[src, 1], coords[dst, 1]
+
         # Plotly 그래프 생성
         edge_trace = go.Scatter(
-            x=[], y=[], 
+            x=edge_x, y=edge_y,
             line=dict(width=0.5, color='#888'),
             hoverinfo='none',
             mode='lines')
 
-        for edge in self.G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_trace['x'] += (x0, x1, None)
-            edge_trace['y'] += (y0, y1, None)
-
         node_trace = go.Scatter(
-            x=[], y=[],
-            text=[],
+            x=coords[:, 0], y=coords[:, 1],
+            text=nodes,
             mode='markers+text',
             hoverinfo='text',
             marker=dict(
@@ -87,12 +127,6 @@ class KnowledgeMap:
                 size=20,
                 line_width=2))
 
-        for node in self.G.nodes():
-            x, y = pos[node]
-            node_trace['x'] += (x,)
-            node_trace['y'] += (y,)
-            node_trace['text'] += (node,)
-
         fig = go.Figure(data=[edge_trace, node_trace],
                      layout=go.Layout(
                         showlegend=False,
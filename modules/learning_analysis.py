@@ -3,11 +3,50 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
 from datetime import datetime, timedelta
 from core.processor import DataProcessor
 
+_PX = None
+
+def _px():
+    """plotly.express 지연 로드 (최초 렌더링 시 한 번만 import)"""
+    global _PX
+    if _PX is None:
+        import plotly.express as px
+        _PX = px
+    return _PX
+
+@st.cache_data(show_spinner=False)
+def _subject_agg(df: pd.DataFrame) -> pd.DataFrame:
+    """과목별 총 학습 시간, 평균 점수, 효율성을 한 번에 집계"""
+    return (
+        df.groupby('subject', sort=False, observed=True)
+        .agg(study_time=('study_time', 'sum'), score=('score', 'mean'))
+        .assign(efficiency=lambda x: x['score'] / (x['study_time'] / 60))
+        .reset_index()
+    )
+
+@st.cache_data(show_spinner=False)
+def _make_sample_data(start: str, end: str, seed: int = 42) -> pd.DataFrame:
+    """기간별 샘플 학습 데이터 생성 (기간/시드가 같으면 캐시 재사용)"""
+    # 학습 시간 데이터
+    dates = pd.date_range(start=start, end=end, freq='D')
+    subjects = ['수학', '물리', '화학', '영어', '국어']
+
+    # 날짜 x 과목 격자 전체를 한 번에 생성
+    rng = np.random.default_rng(seed)
+    shape = (len(dates), len(subjects))
+    study_time = rng.integers(0, 180, size=shape)  # 0-180분
+    score = rng.integers(70, 100, size=shape)  # 70-100점
+
+    return pd.DataFrame({
+        'date': dates.repeat(len(subjects)),
+        'subject': pd.Categorical(np.tile(subjects, len(dates)), categories=subjects),
+        'study_time': study_time.ravel(),
+        'score': score.ravel()
+    })
+
 class LearningAnalysis:
     def __init__(self):
         self.processor = DataProcessor()
@@ -15,30 +54,14 @@ class LearningAnalysis:
 
     def initialize_sample_data(self):
         """샘플 학습 데이터 초기화"""
-        # 학습 시간 데이터
-        dates = pd.date_range(start='2024-01-01', end='2024-01-31', freq='D')
-        subjects = ['수학', '물리', '화학', '영어', '국어']
-        
-        data = []
-        for date in dates:
-            for subject in subjects:
-                study_time = np.random.randint(0, 180)  # 0-180분
-                score = np.random.randint(70, 100)  # 70-100점
-                data.append({
-                    'date': date,
-                    'subject': subject,
-                    'study_time': study_time,
-                    'score': score
-                })
-        
-        self.study_data = pd.DataFrame(data)
+        self.study_data = _make_sample_data('2024-01-01', '2024-01-31')
 
     def render_time_distribution(self):
         """학습 시간 분포 시각화"""
         st.subheader("과목별 학습 시간 분포")
         
-        fig = px.bar(
-            self.study_data.groupby('subject')['study_time'].sum().reset_index(),
+        fig = _px().bar(
+            _subject_agg(self.study_data),
             x='subject',
             y='study_time',
             color='subject',
@@ -51,8 +74,8 @@ class LearningAnalysis:
         st.subheader("학습 성과 분석")
         
         # 과목별 평균 점수
-        fig_scores = px.line(
-            self.study_data.groupby(['date', 'subject'])['score'].mean().reset_index(),
+        fig_scores = _px().line(
+            self.study_data.groupby(['date', 'subject'], observed=True)['score'].mean().reset_index(),
             x='date',
             y='score',
             color='subject',
@@ -64,14 +87,9 @@ class LearningAnalysis:
         """학습 효율성 분석"""
         st.subheader("학습 효율성 분석")
         
-        efficiency_data = self.study_data.groupby('subject').agg({
-            'study_time': 'sum',
-            'score': 'mean'
-        }).reset_index()
-        
-        efficiency_data['efficiency'] = efficiency_data['score'] / (efficiency_data['study_time'] / 60)
+        efficiency_data = _subject_agg(self.study_data)
         
-        fig = px.scatter(
+        fig = _px().scatter(
             efficiency_data,
             x='study_time',
             y='score',
@@ -87,12 +105,8 @@ class LearningAnalysis:
         st.subheader("맞춤형 학습 추천")
         
         # 효율성이 가장 높은 과목 찾기
-        efficiency_data = self.study_data.groupby('subject').agg({
-            'study_time': 'sum',
-            'score': 'mean'
-        })
-        efficiency_data['efficiency'] = efficiency_data['score'] / (efficiency_data['study_time'] / 60)
-        best_subject = efficiency_data['efficiency'].idxmax()
+        efficiency_data = _subject_agg(self.study_data)
+        best_subject = efficiency_data.loc[efficiency_data['efficiency'].idxmax(), 'subject']
         
         # 추천 사항 표시
         st.info(f"""
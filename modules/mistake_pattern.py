@@ -3,106 +3,194 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 import numpy as np
 from core.processor import DataProcessor
 
+@st.cache_data(show_spinner=False)
+def _build_mistake_data(seed: int = 42) -> pd.DataFrame:
+    """샘플 오답 데이터 생성 (시드가 같으면 캐시 재사용)"""
+    mistake_types = [
+        '계산 실수',
+        '문제 조건 누락',
+        '시간 부족',
+        '개념 이해 부족',
+        '문제 해석 오류'
+    ]
+    
+    subjects = ['수학', '물리', '화학', '영어', '국어']
+    dates = pd.date_range(start='2024-01-01', end='2024-01-31', freq='D')
+    
+    rng = np.random.default_rng(seed)
+
+    # 각 날짜/과목별로 1-3개의 실수를 열 단위로 한 번에 생성
+    counts = rng.integers(1, 4, size=len(dates) * len(subjects))
+    n = int(counts.sum())
+
+    # 문자열 컬럼은 처음부터 category로 생성 (정수 코드 + 작은 범주 배열)
+    subject_codes = np.repeat(np.tile(np.arange(len(subjects)), len(dates)), counts)
+    difficulties = ['상', '중', '하']
+
+    return pd.DataFrame({
+        'date': np.repeat(dates.repeat(len(subjects)), counts),
+        'subject': pd.Categorical.from_codes(subject_codes, categories=subjects),
+        'mistake_type': pd.Categorical.from_codes(
+            rng.integers(0, len(mistake_types), size=n), categories=mistake_types
+        ),
+        'problem_difficulty': pd.Categorical.from_codes(
+            rng.integers(0, len(difficulties), size=n), categories=difficulties
+        ),
+        'time_spent': rng.integers(1, 10, size=n),  # 문제 풀이 시간(분)
+        'is_repeated': rng.integers(0, 2, size=n).astype(bool),
+        'stress_level': rng.integers(1, 6, size=n)  # 스트레스 레벨 (1-5)
+    })
+
+@st.cache_data(show_spinner=False)
+def _all_aggs(df: pd.DataFrame) -> Dict[str, Any]:
+    """탭별 시각화에 필요한 집계를 한 번에 계산"""
+    return dict(
+        pivot=df.groupby(['subject', 'mistake_type'], observed=True).size().unstack(fill_value=0),
+        trend=df.groupby(['date', 'mistake_type'], observed=True).size().reset_index(name='count'),
+        stress=df.groupby('stress_level').size().reset_index(name='mistake_count'),
+        common=df['mistake_type'].value_counts(),
+        subject=df['subject'].value_counts()
+    )
+
+# 추세선 하나당 브라우저로 보내는 최대 점 개수
+TREND_MAX_POINTS = 500
+
+def _lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링 (선택된 점의 인덱스 반환)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 첫 점과 마지막 점은 고정, 나머지는 threshold-2개 버킷에서 하나씩 선택
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 버킷의 평균점 (마지막 버킷은 마지막 점)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # 이전 선택점-후보점-다음 버킷 평균점이 이루는 삼각형 넓이가 최대인 점
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    return selected
+
+@st.cache_data(show_spinner=False)
+def _filter_by_date(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """선택한 기간(종료일 포함)의 오답 데이터만 추출"""
+    dates = df['date']
+    mask = (dates >= pd.Timestamp(start_date)) & (dates < pd.Timestamp(end_date) + pd.Timedelta(days=1))
+    return df[mask]
+
 class MistakePatternAnalysis:
     def __init__(self):
         self.processor = DataProcessor()
         self.initialize_sample_data()
         
-    def initialize_sample_data(self):
+    def initialize_sample_data(self, seed: int = 42):
         """샘플 오답 데이터 초기화"""
-        mistake_types = [
-            '계산 실수',
-            '문제 조건 누락',
-            '시간 부족',
-            '개념 이해 부족',
-            '문제 해석 오류'
-        ]
-        
-        subjects = ['수학', '물리', '화학', '영어', '국어']
-        dates = pd.date_range(start='2024-01-01', end='2024-01-31', freq='D')
-        
-        data = []
-        for date in dates:
-            for subject in subjects:
-                # 각 과목별로 1-3개의 실수 생성
-                for _ in range(np.random.randint(1, 4)):
-                    data.append({
-                        'date': date,
-                        'subject': subject,
-                        'mistake_type': np.random.choice(mistake_types),
-                        'problem_difficulty': np.random.choice(['상', '중', '하']),
-                        'time_spent': np.random.randint(1, 10),  # 문제 풀이 시간(분)
-                        'is_repeated': np.random.choice([True, False]),
-                        'stress_level': np.random.randint(1, 6)  # 스트레스 레벨 (1-5)
-                    })
-        
-        self.mistake_data = pd.DataFrame(data)
+        self.mistake_data = _build_mistake_data(seed)
 
-    def render_pattern_overview(self):
+    @st.fragment
+    def render_pattern_overview(self, aggs: Optional[Dict[str, Any]] = None):
         """실수 패턴 개요 시각화"""
         st.subheader("실수 패턴 분석")
+        aggs = aggs or _all_aggs(self.mistake_data)
         
         # 과목별, 실수 유형별 히트맵
-        pivot_data = pd.crosstab(
-            self.mistake_data['subject'],
-            self.mistake_data['mistake_type']
-        )
+        pivot_data = aggs['pivot']
         
-        fig = px.imshow(
-            pivot_data,
-            labels=dict(x="실수 유형", y="과목", color="빈도"),
-            title="과목별 실수 유형 분포"
+        fig = go.Figure(go.Heatmap(
+            z=pivot_data.values,
+            x=pivot_data.columns,
+            y=pivot_data.index,
+            colorbar=dict(title="빈도")
+        ))
+        fig.update_layout(
+            title="과목별 실수 유형 분포",
+            xaxis_title="실수 유형",
+            yaxis_title="과목"
         )
         st.plotly_chart(fig, use_container_width=True)
 
-    def render_trend_analysis(self):
+    @st.fragment
+    def render_trend_analysis(self, aggs: Optional[Dict[str, Any]] = None):
         """실수 추세 분석"""
         st.subheader("실수 패턴 추세")
+        aggs = aggs or _all_aggs(self.mistake_data)
         
         # 시간에 따른 실수 빈도 변화
-        trend_data = self.mistake_data.groupby(['date', 'mistake_type']).size().reset_index(name='count')
+        trend_data = aggs['trend']
         
-        fig = px.line(
-            trend_data,
-            x='date',
-            y='count',
-            color='mistake_type',
-            title='실수 유형별 추세'
+        wide = trend_data.set_index(['date', 'mistake_type'])['count'].unstack('mistake_type')
+
+        # WebGL 렌더링 + 긴 기간은 LTTB로 점 개수 제한
+        fig = go.Figure()
+        for col in wide.columns:
+            series = wide[col].dropna()
+            x = series.index.to_numpy()
+            y = series.to_numpy(dtype=float)
+            idx = _lttb(x.astype('int64').astype(float), y, TREND_MAX_POINTS)
+            fig.add_trace(go.Scattergl(x=x[idx], y=y[idx], mode='lines', name=col))
+        fig.update_layout(
+            title='실수 유형별 추세',
+            xaxis_title='date',
+            yaxis_title='count',
+            legend_title='mistake_type'
         )
         st.plotly_chart(fig, use_container_width=True)
 
-    def render_correlation_analysis(self):
+    @st.fragment
+    def render_correlation_analysis(self, aggs: Optional[Dict[str, Any]] = None):
         """실수 상관관계 분석"""
         st.subheader("실수 요인 분석")
+        aggs = aggs or _all_aggs(self.mistake_data)
         
         # 스트레스 레벨과 실수 빈도의 상관관계
-        stress_mistake = self.mistake_data.groupby('stress_level').size().reset_index(name='mistake_count')
+        stress_mistake = aggs['stress']
         
-        fig = px.scatter(
-            stress_mistake,
-            x='stress_level',
-            y='mistake_count',
+        x = stress_mistake['stress_level'].to_numpy(dtype=float)
+        y = stress_mistake['mistake_count'].to_numpy(dtype=float)
+
+        fig = go.Figure(go.Scatter(x=x, y=y, mode='markers', name='실수 빈도'))
+        # 1차 회귀 추세선 (점이 2개 이상일 때만)
+        if len(x) > 1:
+            slope, intercept = np.polyfit(x, y, 1)
+            fig.add_trace(go.Scatter(
+                x=x, y=slope * x + intercept, mode='lines', name='추세선'
+            ))
+        fig.update_layout(
             title='스트레스 레벨과 실수 빈도의 관계',
-            trendline="ols"
+            xaxis_title='stress_level',
+            yaxis_title='mistake_count'
         )
         st.plotly_chart(fig, use_container_width=True)
 
-    def render_improvement_suggestions(self):
+    @st.fragment
+    def render_improvement_suggestions(self, aggs: Optional[Dict[str, Any]] = None):
         """개선 전략 제안"""
         st.subheader("맞춤형 개선 전략")
+        aggs = aggs or _all_aggs(self.mistake_data)
         
         # 가장 빈번한 실수 유형 파악
-        common_mistakes = self.mistake_data['mistake_type'].value_counts()
+        common_mistakes = aggs['common']
         primary_mistake = common_mistakes.index[0]
         
         # 실수가 가장 많은 과목 파악
-        subject_mistakes = self.mistake_data['subject'].value_counts()
+        subject_mistakes = aggs['subject']
         challenging_subject = subject_mistakes.index[0]
         
         # 개선 전략 제시
@@ -127,20 +215,25 @@ class MistakePatternAnalysis:
         """메인 렌더링 함수"""
         st.write("## 오답 패턴 분석")
         
-        # 기간 선택
+        # 기간 선택 (기본값은 데이터 기간)
+        data_start = self.mistake_data['date'].min().date()
+        data_end = self.mistake_data['date'].max().date()
         col1, col2 = st.columns(2)
         with col1:
-            start_date = st.date_input(
-                "시작일",
-                datetime.now() - timedelta(days=30)
-            )
+            start_date = st.date_input("시작일", data_start)
         with col2:
-            end_date = st.date_input(
-                "종료일",
-                datetime.now()
-            )
+            end_date = st.date_input("종료일", data_end)
+
+        # 날짜가 바뀔 때만 필터링/집계를 다시 계산
+        filtered = _filter_by_date(self.mistake_data, start_date, end_date)
+        if filtered.empty:
+            st.warning("선택한 기간에 오답 기록이 없습니다.")
+            return
 
-        # 분석 탭
+        # 모든 탭이 매 실행마다 렌더링되므로 집계는 한 번만 계산
+        aggs = _all_aggs(filtered)
+
+        # 분석 탭 (각 탭은 fragment로 분리되어 개별적으로 다시 그려짐)
         tab1, tab2, tab3, tab4 = st.tabs([
             "패턴 개요",
             "추세 분석",
@@ -149,17 +242,21 @@ class MistakePatternAnalysis:
         ])
         
         with tab1:
-            self.render_pattern_overview()
+            self.render_pattern_overview(aggs)
         with tab2:
-            self.render_trend_analysis()
+            self.render_trend_analysis(aggs)
         with tab3:
-            self.render_correlation_analysis()
+            self.render_correlation_analysis(aggs)
         with tab4:
-            self.render_improvement_suggestions()
+            self.render_improvement_suggestions(aggs)
+
+        self.render_detail_data(filtered)
 
-        # 상세 데이터 확인
+    @st.fragment
+    def render_detail_data(self, data: pd.DataFrame):
+        """상세 데이터 확인 (체크박스 변경 시 이 부분만 다시 실행)"""
         if st.checkbox("상세 데이터 보기"):
             st.dataframe(
-                self.mistake_data.sort_values('date', ascending=False),
+                data.sort_values('date', ascending=False),
                 use_container_width=True
             )
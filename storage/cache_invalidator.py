@@ -3,6 +3,7 @@
 
 from typing import List, Set, Dict, Any
 import logging
+from collections import deque
 from datetime import datetime
 from storage.cache_manager import CacheManager
 
@@ -24,37 +25,43 @@ class CacheInvalidator:
             keys_to_invalidate = self._get_dependent_keys(key)
             keys_to_invalidate.add(key)
             
+            # 한 번의 왕복으로 비동기 삭제(UNLINK)
+            pipe = self.cache.redis_client.pipeline(transaction=False)
             for k in keys_to_invalidate:
-                self.cache.redis_client.delete(k)
-                self.logger.info(f"Invalidated cache key: {k}")
+                pipe.unlink(k)
+            pipe.execute()
+            self.logger.info(f"Invalidated {len(keys_to_invalidate)} cache keys for: {key}")
                 
             return True
         except Exception as e:
             self.logger.error(f"Error during cache invalidation: {str(e)}")
             return False
             
-    def _get_dependent_keys(self, key: str, visited: Set[str] = None) -> Set[str]:
-        """종속된 모든 캐시 키 조회"""
-        if visited is None:
-            visited = set()
-            
-        dependent_keys = set()
-        if key in self.dependency_graph:
-            for dependent_key in self.dependency_graph[key]:
-                if dependent_key not in visited:
-                    visited.add(dependent_key)
-                    dependent_keys.add(dependent_key)
-                    dependent_keys.update(self._get_dependent_keys(dependent_key, visited))
-                    
-        return dependent_keys
+    def _get_dependent_keys(self, key: str) -> Set[str]:
+        """종속된 모든 캐시 키 조회 (반복 BFS)"""
+        visited: Set[str] = set()
+        queue = deque(self.dependency_graph.get(key, ()))
+        while queue:
+            k = queue.popleft()
+            if k in visited:
+                continue
+            visited.add(k)
+            queue.extend(self.dependency_graph.get(k, ()))
+        return visited
         
     def invalidate_pattern(self, pattern: str) -> bool:
         """패턴과 일치하는 모든 캐시 삭제"""
         try:
-            keys = self.cache.redis_client.keys(pattern)
-            if keys:
-                self.cache.redis_client.delete(*keys)
-                self.logger.info(f"Invalidated {len(keys)} keys matching pattern: {pattern}")
+            # KEYS 대신 SCAN으로 순회하여 Redis 서버 블로킹 방지
+            client = self.cache.redis_client
+            pipe = client.pipeline(transaction=False)
+            count = 0
+            for k in client.scan_iter(match=pattern, count=500):
+                pipe.unlink(k)
+                count += 1
+            if count:
+                pipe.execute()
+                self.logger.info(f"Invalidated {count} keys matching pattern: {pattern}")
             return True
         except Exception as e:
             self.logger.error(f"Error during pattern invalidation: {str(e)}")
@@ -62,8 +69,7 @@ class CacheInvalidator:
             
     def invalidate_user_data(self, user_id: int) -> bool:
         """사용자 관련 모든 캐시 삭제"""
-        pattern = f"mindmap_pro:*:{user_id}*"
-        return self.invalidate_pattern(pattern)
+        return self.cache.invalidate_user_cache(user_id)
         
     def invalidate_knowledge_map(self, map_id: int) -> bool:
         """지식맵 관련 캐시 삭제"""
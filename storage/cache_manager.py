@@ -2,42 +2,212 @@
 # Cache Management System for MindMap Pro
 
 import redis
-import json
-from typing import Any, Optional, Dict, List
-from datetime import datetime, timedelta
-import pickle
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+import orjson
+import msgpack
+import lz4.frame
+import networkx as nx
+from typing import Any, Optional, Dict, List, Iterator
+from datetime import date, datetime, timedelta
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# numpy 값과 정수 키를 그대로 직렬화
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _dumps(data: Any) -> bytes:
+    """JSON 직렬화 (orjson)"""
+    return orjson.dumps(data, option=_ORJSON_OPTIONS)
+
+# 타입 정보를 유지해야 하는 값의 msgpack 확장 타입 코드 (튜플 노드 ID, 날짜 속성 등)
+_EXT_TUPLE = 1
+_EXT_SET = 2
+_EXT_FROZENSET = 3
+_EXT_DATETIME = 4
+_EXT_DATE = 5
+
+def _msgpack_default(obj: Any) -> Any:
+    """msgpack이 직접 처리하지 못하는 값 변환 (지원하지 않는 타입은 TypeError)"""
+    if isinstance(obj, tuple):
+        return msgpack.ExtType(_EXT_TUPLE, _packb(list(obj)))
+    if isinstance(obj, frozenset):
+        return msgpack.ExtType(_EXT_FROZENSET, _packb(list(obj)))
+    if isinstance(obj, set):
+        return msgpack.ExtType(_EXT_SET, _packb(list(obj)))
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    # strict_types에서는 dict/list 하위 클래스도 여기로 옴
+    if isinstance(obj, dict):
+        return dict(obj)
+    if isinstance(obj, list):
+        return list(obj)
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Cannot cache value of type {type(obj).__name__}")
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """확장 타입 복원"""
+    if code == _EXT_TUPLE:
+        return tuple(_unpackb(data))
+    if code == _EXT_SET:
+        return set(_unpackb(data))
+    if code == _EXT_FROZENSET:
+        return frozenset(_unpackb(data))
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+def _packb(obj: Any) -> bytes:
+    """msgpack 직렬화 (튜플도 확장 타입으로 보내도록 strict_types 사용)"""
+    return msgpack.packb(obj, use_bin_type=True, strict_types=True, default=_msgpack_default)
+
+def _unpackb(data: bytes) -> Any:
+    """msgpack 역직렬화"""
+    return msgpack.unpackb(data, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+
+def _pack(obj: Any) -> bytes:
+    """msgpack 직렬화 후 lz4 압축"""
+    return lz4.frame.compress(_packb(obj))
+
+def _unpack(data: bytes) -> Any:
+    """lz4 해제 후 msgpack 역직렬화"""
+    return _unpackb(lz4.frame.decompress(data))
+
+def _split_graph(graph_data: Any) -> Dict[str, bytes]:
+    """지식맵을 해시 필드(meta/nodes/edges)별로 직렬화"""
+    # 노드 ID는 [n, attrs]로 저장되며, str/int 외의 ID(튜플, frozenset, 날짜)는
+    # _msgpack_default의 확장 타입 태그로 보존되고 그 외 타입은 쓰기 시점에 TypeError
+    if isinstance(graph_data, nx.Graph):
+        multigraph = graph_data.is_multigraph()
+        edges = graph_data.edges(keys=True, data=True) if multigraph else graph_data.edges(data=True)
+        return {
+            'meta': _pack({
+                'type': 'networkx',
+                'directed': graph_data.is_directed(),
+                'multigraph': multigraph,
+                'graph': dict(graph_data.graph)
+            }),
+            'nodes': _pack([[n, attrs] for n, attrs in graph_data.nodes(data=True)]),
+            'edges': _pack([list(e) for e in edges])
+        }
+    if isinstance(graph_data, dict) and {'nodes', 'edges'} <= graph_data.keys():
+        rest = {k: v for k, v in graph_data.items() if k not in ('nodes', 'edges')}
+        return {
+            'meta': _pack({'type': 'dict', 'extra': rest}),
+            'nodes': _pack(graph_data['nodes']),
+            'edges': _pack(graph_data['edges'])
+        }
+    return {'meta': _pack({'type': 'raw'}), 'data': _pack(graph_data)}
+
+def _join_graph(fields: Dict[bytes, bytes]) -> Any:
+    """해시 필드에서 지식맵 복원"""
+    meta = _unpack(fields[b'meta'])
+    if meta['type'] == 'raw':
+        return _unpack(fields[b'data'])
+
+    nodes = _unpack(fields[b'nodes'])
+    edges = _unpack(fields[b'edges'])
+    if meta['type'] == 'dict':
+        return {**meta['extra'], 'nodes': nodes, 'edges': edges}
+
+    if meta['multigraph']:
+        graph = nx.MultiDiGraph() if meta['directed'] else nx.MultiGraph()
+    else:
+        graph = nx.DiGraph() if meta['directed'] else nx.Graph()
+    graph.graph.update(meta['graph'])
+    graph.add_nodes_from((n, attrs) for n, attrs in nodes)
+    graph.add_edges_from(tuple(e) for e in edges)
+    return graph
+
+# 사용자 키 목록의 최소 TTL (초). 목록 항목은 키 이름뿐이라 오래 남아도 무해함
+USER_INDEX_TTL = 24 * 3600
+
+# (host, port, db, decode_responses)별 연결 풀 (CacheManager 인스턴스 간 공유)
+REDIS_MAX_CONNECTIONS = 32
+_POOLS: Dict[tuple, redis.ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+def _get_connection_pool(host: str, port: int, db: int,
+                         decode_responses: bool) -> redis.ConnectionPool:
+    """공유 연결 풀 조회 (없으면 생성)"""
+    pool_key = (host, port, db, decode_responses)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(pool_key)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=host,
+                port=port,
+                db=db,
+                decode_responses=decode_responses,
+                encoding='utf-8',
+                max_connections=REDIS_MAX_CONNECTIONS,
+                socket_keepalive=True
+            )
+            _POOLS[pool_key] = pool
+        return pool
 
 class CacheManager:
     def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0):
         self.redis_client = redis.Redis(
-            host=host,
-            port=port,
-            db=db,
-            decode_responses=True,
-            encoding='utf-8'
+            connection_pool=_get_connection_pool(host, port, db, True)
         )
         self.binary_redis = redis.Redis(
-            host=host,
-            port=port,
-            db=db
+            connection_pool=_get_connection_pool(host, port, db, False)
         )
+        self.logger = logging.getLogger(__name__)
         
-    def _get_key(self, prefix: str, identifier: str) -> str:
-        """캐시 키 생성"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_key(prefix: str, identifier: str) -> str:
+        """캐시 키 생성 (같은 키 문자열은 재사용)"""
         return f"mindmap_pro:{prefix}:{identifier}"
 
-    def set_user_data(self, user_id: int, data: Dict, expire_time: int = 3600) -> bool:
-        """사용자 데이터 캐싱"""
+    @contextmanager
+    def pipeline(self) -> Iterator[redis.client.Pipeline]:
+        """명령을 모아 블록 종료 시 한 번의 왕복으로 실행하는 파이프라인"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        try:
+            yield pipe
+            pipe.execute()
+        finally:
+            pipe.reset()
+
+    def _user_index_key(self, user_id: int) -> str:
+        """사용자별 캐시 키 목록(SET) 키"""
+        return self._get_key("index:user", str(user_id))
+
+    def _setex_for_user(self, user_id: int, key: str, expire_time: int, value: bytes,
+                        pipe: Optional[redis.client.Pipeline] = None):
+        """값을 저장하고 사용자 키 목록에 등록 (한 번의 왕복, pipe가 주어지면 명령만 추가하며 실행은 호출자 몫)"""
+        index_key = self._user_index_key(user_id)
+        own_pipe = pipe is None
+        if own_pipe:
+            pipe = self.redis_client.pipeline(transaction=False)
+        pipe.setex(key, expire_time, value)
+        pipe.sadd(index_key, key)
+        # 목록이 등록된 키보다 먼저 만료되지 않도록 넉넉한 TTL 부여
+        # (EXPIRE NX/GT는 Redis 7 이상 전용이라 사용하지 않음)
+        pipe.expire(index_key, max(expire_time, USER_INDEX_TTL))
+        if own_pipe:
+            pipe.execute()
+
+    def set_user_data(self, user_id: int, data: Dict, expire_time: int = 3600,
+                      pipe: Optional[redis.client.Pipeline] = None) -> bool:
+        """사용자 데이터 캐싱 (pipe가 주어지면 명령만 추가하고 True는 대기열 추가만 의미)"""
+        # pipe 사용 시 Redis 오류는 여기서 잡히지 않고 pipeline() 블록 종료(execute) 시 발생
         key = self._get_key("user", str(user_id))
         try:
-            self.redis_client.setex(
-                key,
-                expire_time,
-                json.dumps(data)
-            )
+            self._setex_for_user(user_id, key, expire_time, _dumps(data), pipe)
             return True
-        except Exception as e:
-            print(f"Error caching user data: {str(e)}")
+        except Exception:
+            self.logger.exception("Error caching user data")
             return False
 
     def get_user_data(self, user_id: int) -> Optional[Dict]:
@@ -45,33 +215,37 @@ class CacheManager:
         key = self._get_key("user", str(user_id))
         try:
             data = self.redis_client.get(key)
-            return json.loads(data) if data else None
-        except Exception as e:
-            print(f"Error retrieving user data: {str(e)}")
+            return orjson.loads(data) if data else None
+        except Exception:
+            self.logger.exception("Error retrieving user data")
             return None
 
     def cache_knowledge_map(self, map_id: int, graph_data: Any, expire_time: int = 3600) -> bool:
-        """지식맵 데이터 캐싱"""
+        """지식맵 데이터 캐싱 (노드/엣지를 별도 해시 필드로 저장)"""
         key = self._get_key("knowledge_map", str(map_id))
         try:
-            self.binary_redis.setex(
-                key,
-                expire_time,
-                pickle.dumps(graph_data)
-            )
+            pipe = self.binary_redis.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=_split_graph(graph_data))
+            pipe.expire(key, expire_time)
+            pipe.execute()
             return True
-        except Exception as e:
-            print(f"Error caching knowledge map: {str(e)}")
+        except Exception:
+            self.logger.exception("Error caching knowledge map")
             return False
 
-    def get_cached_knowledge_map(self, map_id: int) -> Optional[Any]:
-        """캐시된 지식맵 조회"""
+    def get_cached_knowledge_map(self, map_id: int, part: Optional[str] = None) -> Optional[Any]:
+        """캐시된 지식맵 조회 (part='nodes' 또는 'edges'이면 해당 필드만 조회)"""
         key = self._get_key("knowledge_map", str(map_id))
         try:
-            data = self.binary_redis.get(key)
-            return pickle.loads(data) if data else None
-        except Exception as e:
-            print(f"Error retrieving knowledge map: {str(e)}")
+            if part is not None:
+                data = self.binary_redis.hget(key, part)
+                return _unpack(data) if data else None
+
+            fields = self.binary_redis.hgetall(key)
+            return _join_graph(fields) if fields else None
+        except Exception:
+            self.logger.exception("Error retrieving knowledge map")
             return None
 
     def cache_analysis_results(self, user_id: int, analysis_type: str,
@@ -79,14 +253,10 @@ class CacheManager:
         """분석 결과 캐싱"""
         key = self._get_key(f"analysis:{analysis_type}", str(user_id))
         try:
-            self.redis_client.setex(
-                key,
-                expire_time,
-                json.dumps(results)
-            )
+            self._setex_for_user(user_id, key, expire_time, _dumps(results))
             return True
-        except Exception as e:
-            print(f"Error caching analysis results: {str(e)}")
+        except Exception:
+            self.logger.exception("Error caching analysis results")
             return False
 
     def get_cached_analysis(self, user_id: int, analysis_type: str) -> Optional[Dict]:
@@ -94,9 +264,9 @@ class CacheManager:
         key = self._get_key(f"analysis:{analysis_type}", str(user_id))
         try:
             data = self.redis_client.get(key)
-            return json.loads(data) if data else None
-        except Exception as e:
-            print(f"Error retrieving analysis results: {str(e)}")
+            return orjson.loads(data) if data else None
+        except Exception:
+            self.logger.exception("Error retrieving analysis results")
             return None
 
     def cache_study_statistics(self, user_id: int, stats: Dict,
@@ -104,14 +274,10 @@ class CacheManager:
         """학습 통계 캐싱"""
         key = self._get_key("study_stats", str(user_id))
         try:
-            self.redis_client.setex(
-                key,
-                expire_time,
-                json.dumps(stats)
-            )
+            self._setex_for_user(user_id, key, expire_time, _dumps(stats))
             return True
-        except Exception as e:
-            print(f"Error caching study statistics: {str(e)}")
+        except Exception:
+            self.logger.exception("Error caching study statistics")
             return False
 
     def get_cached_study_statistics(self, user_id: int) -> Optional[Dict]:
@@ -119,21 +285,44 @@ class CacheManager:
         key = self._get_key("study_stats", str(user_id))
         try:
             data = self.redis_client.get(key)
-            return json.loads(data) if data else None
-        except Exception as e:
-            print(f"Error retrieving study statistics: {str(e)}")
+            return orjson.loads(data) if data else None
+        except Exception:
+            self.logger.exception("Error retrieving study statistics")
+            return None
+
+    def get_rate_limit(self, scope: str, identifier: str) -> Optional[int]:
+        """현재 윈도우의 요청 카운터 조회 (증가시키지 않음, Redis 장애 시 None)"""
+        key = self._get_key(f"rate_limit:{scope}", identifier)
+        try:
+            count = self.redis_client.get(key)
+            return int(count) if count else 0
+        except Exception:
+            self.logger.exception("Rate limiter unavailable: error reading counter for %s", scope)
+            return None
+
+    def hit_rate_limit(self, scope: str, identifier: str, window: int = 60) -> Optional[int]:
+        """고정 윈도우 요청 카운터 증가 후 현재 횟수 반환 (Redis 장애 시 None)"""
+        key = self._get_key(f"rate_limit:{scope}", identifier)
+        try:
+            # SET NX EX로 TTL과 함께 카운터를 만든 뒤 INCR (Redis 7 미만에서도 동작)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(key, 0, ex=window, nx=True)
+            pipe.incr(key)
+            _, count = pipe.execute()
+            return count
+        except Exception:
+            self.logger.exception("Rate limiter unavailable: error updating counter for %s", scope)
             return None
 
     def invalidate_user_cache(self, user_id: int) -> bool:
         """사용자 관련 캐시 무효화"""
         try:
-            pattern = self._get_key("*", str(user_id))
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                self.redis_client.delete(*keys)
+            index_key = self._user_index_key(user_id)
+            keys = self.redis_client.smembers(index_key)
+            self.redis_client.unlink(*keys, index_key)
             return True
-        except Exception as e:
-            print(f"Error invalidating user cache: {str(e)}")
+        except Exception:
+            self.logger.exception("Error invalidating user cache")
             return False
 
     def clear_all_cache(self) -> bool:
@@ -141,8 +330,8 @@ class CacheManager:
         try:
             self.redis_client.flushdb()
             return True
-        except Exception as e:
-            print(f"Error clearing cache: {str(e)}")
+        except Exception:
+            self.logger.exception("Error clearing cache")
             return False
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -155,6 +344,6 @@ class CacheManager:
                 'total_keys': self.redis_client.dbsize(),
                 'uptime_days': info['uptime_in_days']
             }
-        except Exception as e:
-            print(f"Error getting cache stats: {str(e)}")
+        except Exception:
+            self.logger.exception("Error getting cache stats")
             return {}
@@ -2,19 +2,72 @@
 # Database Management Module for MindMap Pro
 
 import sqlite3
-import pandas as pd
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Sequence
 import os
 
+# 연결 단위 성능 설정 (WAL 저널, 64MB 페이지 캐시, 256MB mmap)
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+
+# user_id 단위 사용자 조회 캐시 최대 크기 / 유지 시간(초)
+USER_CACHE_SIZE = 4096
+USER_CACHE_TTL = 60
+
 class DatabaseManager:
     def __init__(self, db_path: str = "mindmap_pro.db"):
         self.db_path = db_path
+        # 호출마다 새 연결을 여는 대신 하나의 연결을 재사용 (autocommit 모드)
+        self.conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self.conn.executescript(_PRAGMAS)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._user_cache: OrderedDict = OrderedDict()
         self.initialize_database()
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """블록 전체를 하나의 트랜잭션으로 실행 (이미 트랜잭션 중이면 SAVEPOINT로 중첩)"""
+        with self._lock:
+            conn = self.conn
+            if conn.in_transaction:
+                conn.execute("SAVEPOINT txn")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK TO txn")
+                    conn.execute("RELEASE txn")
+                    raise
+                conn.execute("RELEASE txn")
+            else:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
     
     def initialize_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             
             # 사용자 테이블
@@ -98,65 +151,131 @@ class DatabaseManager:
                     FOREIGN KEY (user_id) REFERENCES users (user_id)
                 )
             """)
-            
-            conn.commit()
+
+            # 통계 조회(WHERE user_id/created_at, GROUP BY subject)용 인덱스
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_study_user_date
+                ON study_records (user_id, created_at, subject)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mistake_user_date
+                ON mistake_records (user_id, created_at, subject, mistake_type)
+            """)
+            # 실수 패턴 집계용 커버링 인덱스: (subject, mistake_type) 순서로 정렬되어 있어
+            # GROUP BY를 임시 B-tree 없이 인덱스 한 번 순회로 처리
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mistake_user_group
+                ON mistake_records (user_id, subject, mistake_type,
+                                    time_spent, is_repeated, stress_level, created_at)
+            """)
+
+            # 지식맵별 노드/엣지 조회용 인덱스
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_map ON concept_nodes (map_id)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_edges_map ON concept_edges (map_id)"
+            )
+
+            # 사용자별 지식맵 조회용 인덱스
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_maps_user ON knowledge_maps (user_id)"
+            )
 
     def add_user(self, username: str, password_hash: str) -> int:
         """새로운 사용자 추가"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO users (username, password_hash) VALUES (?, ?)",
                 (username, password_hash)
             )
-            conn.commit()
+            # 롤백으로 재사용된 user_id의 이전 캐시 제거
+            self._user_cache.pop(cursor.lastrowid, None)
             return cursor.lastrowid
 
     def get_user(self, username: str) -> Dict:
         """사용자 정보 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM users WHERE username = ?",
                 (username,)
             )
             result = cursor.fetchone()
-            if result:
-                return {
-                    'user_id': result[0],
-                    'username': result[1],
-                    'password_hash': result[2],
-                    'created_at': result[3],
-                    'last_login': result[4]
-                }
-            return None
+            return dict(result) if result else None
+
+    def get_user_by_id(self, user_id: int) -> Dict:
+        """사용자 정보 조회 (user_id 기준, USER_CACHE_TTL 동안 캐시)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._user_cache.get(user_id)
+            if cached is not None and cached[1] > now:
+                self._user_cache.move_to_end(user_id)
+                return dict(cached[0])
+
+            result = self.conn.execute(
+                "SELECT * FROM users WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+            if result is None:
+                self._user_cache.pop(user_id, None)
+                return None
+
+            user = dict(result)
+            self._user_cache[user_id] = (user, now + USER_CACHE_TTL)
+            self._user_cache.move_to_end(user_id)
+            if len(self._user_cache) > USER_CACHE_SIZE:
+                self._user_cache.popitem(last=False)
+            return dict(user)
+
+    def update_last_login(self, user_id: int):
+        """마지막 로그인 시간 갱신"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE user_id = ?",
+                (user_id,)
+            )
+            self._user_cache.pop(user_id, None)
+
+    def update_password(self, user_id: int, password_hash: str):
+        """비밀번호 해시 갱신"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE users SET password_hash = ? WHERE user_id = ?",
+                (password_hash, user_id)
+            )
+            self._user_cache.pop(user_id, None)
 
     def add_knowledge_map(self, user_id: int, subject: str) -> int:
         """새로운 지식맵 추가"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO knowledge_maps (user_id, subject) VALUES (?, ?)",
                 (user_id, subject)
             )
-            conn.commit()
             return cursor.lastrowid
 
     def add_concept_node(self, map_id: int, concept: str, subject: str, level: int = 1) -> int:
         """새로운 개념 노드 추가"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO concept_nodes (map_id, concept, subject, level) VALUES (?, ?, ?, ?)",
                 (map_id, concept, subject, level)
             )
-            conn.commit()
             return cursor.lastrowid
 
     def add_concept_edge(self, map_id: int, source_id: int, target_id: int,
                         relationship_type: str = None, strength: float = 1.0) -> int:
         """개념 간 연결 추가"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 """INSERT INTO concept_edges 
@@ -164,52 +283,81 @@ class DatabaseManager:
                    VALUES (?, ?, ?, ?, ?)""",
                 (map_id, source_id, target_id, relationship_type, strength)
             )
-            conn.commit()
             return cursor.lastrowid
 
     def get_knowledge_map(self, map_id: int) -> Dict:
         """지식맵 전체 데이터 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             # 노드 조회
-            nodes = pd.read_sql_query(
+            nodes = conn.execute(
                 "SELECT * FROM concept_nodes WHERE map_id = ?",
-                conn,
-                params=(map_id,)
-            )
+                (map_id,)
+            ).fetchall()
             
             # 엣지 조회
-            edges = pd.read_sql_query(
-                "# File: storage/database.py (continued)
-
+            edges = conn.execute(
                 "SELECT * FROM concept_edges WHERE map_id = ?",
-                conn,
-                params=(map_id,)
-            )
+                (map_id,)
+            ).fetchall()
             
             return {
-                'nodes': nodes.to_dict('records'),
-                'edges': edges.to_dict('records')
+                'nodes': [dict(r) for r in nodes],
+                'edges': [dict(r) for r in edges]
             }
 
+    def get_user_knowledge_maps(self, user_id: int) -> List[Dict]:
+        """사용자의 지식맵 목록 조회"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM knowledge_maps WHERE user_id = ? ORDER BY map_id",
+                (user_id,)
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def get_nodes_for_user(self, user_id: int) -> List[Dict]:
+        """사용자의 모든 지식맵 노드 조회 (map_id 포함, 한 번의 쿼리)"""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT n.* FROM concept_nodes n
+                   JOIN knowledge_maps m ON m.map_id = n.map_id
+                   WHERE m.user_id = ?
+                   ORDER BY n.map_id, n.node_id""",
+                (user_id,)
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def get_edges_for_user(self, user_id: int) -> List[Dict]:
+        """사용자의 모든 지식맵 엣지 조회 (map_id 포함, 한 번의 쿼리)"""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT e.* FROM concept_edges e
+                   JOIN knowledge_maps m ON m.map_id = e.map_id
+                   WHERE m.user_id = ?
+                   ORDER BY e.map_id, e.edge_id""",
+                (user_id,)
+            ).fetchall()
+            return [dict(r) for r in rows]
+
     def add_study_record(self, user_id: int, subject: str, study_time: int,
-                        score: float = None, stress_level: int = None) -> int:
-        """학습 기록 추가"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+                        score: float = None, stress_level: int = None) -> Dict:
+        """학습 기록 추가 (저장된 행을 바로 반환)"""
+        with self._lock:
+            row = self.conn.execute(
                 """INSERT INTO study_records 
                    (user_id, subject, study_time, score, stress_level)
-                   VALUES (?, ?, ?, ?, ?)""",
+                   VALUES (?, ?, ?, ?, ?)
+                   RETURNING *""",
                 (user_id, subject, study_time, score, stress_level)
-            )
-            conn.commit()
-            return cursor.lastrowid
+            ).fetchone()
+            return dict(row)
 
     def add_mistake_record(self, user_id: int, subject: str, mistake_type: str,
                           problem_difficulty: str, time_spent: int,
                           is_repeated: bool, stress_level: int) -> int:
         """실수 기록 추가"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
             cursor.execute(
                 """INSERT INTO mistake_records 
@@ -219,13 +367,84 @@ class DatabaseManager:
                 (user_id, subject, mistake_type, problem_difficulty,
                  time_spent, is_repeated, stress_level)
             )
-            conn.commit()
             return cursor.lastrowid
 
+    def _iter_rows(self, query: str, params: Sequence,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """조회 결과를 배치 단위로 가져오며 한 행씩 반환 (전체 결과를 메모리에 올리지 않음)"""
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+    def iter_study_records(self, user_id: int) -> Iterator[Dict]:
+        """사용자 학습 기록 순회"""
+        return self._iter_rows(
+            "SELECT * FROM study_records WHERE user_id = ? ORDER BY record_id",
+            (user_id,)
+        )
+
+    def iter_mistake_records(self, user_id: int) -> Iterator[Dict]:
+        """사용자 실수 기록 순회"""
+        return self._iter_rows(
+            "SELECT * FROM mistake_records WHERE user_id = ? ORDER BY mistake_id",
+            (user_id,)
+        )
+
+    def _executemany_in_transaction(self, query: str, rows: Iterable[Sequence]) -> int:
+        """여러 행을 하나의 트랜잭션으로 삽입"""
+        with self.transaction() as conn:
+            return conn.executemany(query, rows).rowcount
+
+    def add_concept_nodes_bulk(self, map_id: int, rows: Iterable[Sequence]) -> List[int]:
+        """개념 노드 일괄 추가 (rows: concept, subject, level) - 입력 순서대로 node_id 반환"""
+        with self.transaction() as conn:
+            count = conn.executemany(
+                "INSERT INTO concept_nodes (map_id, concept, subject, level) VALUES (?, ?, ?, ?)",
+                ((map_id, *row) for row in rows)
+            ).rowcount
+            # 쓰기 잠금을 쥔 한 트랜잭션 안의 AUTOINCREMENT 삽입은 연속된 node_id를 받음
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - count + 1, last_id + 1))
+
+    def add_concept_edges_bulk(self, rows: Iterable[Sequence]) -> int:
+        """개념 연결 일괄 추가 (rows: map_id, source_id, target_id, relationship_type, strength)"""
+        return self._executemany_in_transaction(
+            """INSERT INTO concept_edges 
+               (map_id, source_node_id, target_node_id, relationship_type, strength)
+               VALUES (?, ?, ?, ?, ?)""",
+            rows
+        )
+
+    def add_study_records_bulk(self, rows: Iterable[Sequence]) -> int:
+        """학습 기록 일괄 추가 (rows: user_id, subject, study_time, score, stress_level)"""
+        return self._executemany_in_transaction(
+            """INSERT INTO study_records 
+               (user_id, subject, study_time, score, stress_level)
+               VALUES (?, ?, ?, ?, ?)""",
+            rows
+        )
+
+    def add_mistake_records_bulk(self, rows: Iterable[Sequence]) -> int:
+        """실수 기록 일괄 추가 (rows: add_mistake_record와 같은 순서의 튜플)"""
+        return self._executemany_in_transaction(
+            """INSERT INTO mistake_records 
+               (user_id, subject, mistake_type, problem_difficulty,
+                time_spent, is_repeated, stress_level)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows
+        )
+
     def get_study_statistics(self, user_id: int, start_date: datetime = None,
                            end_date: datetime = None) -> Dict[str, Any]:
         """학습 통계 분석"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             query = """
                 SELECT 
                     subject,
@@ -248,12 +467,13 @@ class DatabaseManager:
                 
             query += " GROUP BY subject"
             
-            return pd.read_sql_query(query, conn, params=params).to_dict('records')
+            return [dict(r) for r in conn.execute(query, params).fetchall()]
 
     def get_mistake_patterns(self, user_id: int, start_date: datetime = None,
                            end_date: datetime = None) -> Dict[str, Any]:
         """실수 패턴 분석"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             query = """
                 SELECT 
                     subject,
@@ -276,11 +496,12 @@ class DatabaseManager:
                 
             query += " GROUP BY subject, mistake_type"
             
-            return pd.read_sql_query(query, conn, params=params).to_dict('records')
+            return [dict(r) for r in conn.execute(query, params).fetchall()]
 
     def get_learning_efficiency(self, user_id: int) -> Dict[str, float]:
         """학습 효율성 분석"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             query = """
                 SELECT 
                     subject,
@@ -292,16 +513,16 @@ class DatabaseManager:
                 WHERE user_id = ? AND study_time > 0 AND score IS NOT NULL
                 GROUP BY subject
             """
-            return pd.read_sql_query(query, conn, params=[user_id]).to_dict('records')
+            return [dict(r) for r in conn.execute(query, (user_id,)).fetchall()]
 
     def backup_database(self, backup_path: str = None) -> str:
         """데이터베이스 백업"""
         if not backup_path:
             backup_path = f"backup_mindmap_pro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
             
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
             backup = sqlite3.connect(backup_path)
-            conn.backup(backup)
+            self.conn.backup(backup)
             backup.close()
             
         return backup_path
@@ -309,11 +530,12 @@ class DatabaseManager:
     def restore_database(self, backup_path: str) -> bool:
         """데이터베이스 복원"""
         try:
-            with sqlite3.connect(backup_path) as backup:
-                conn = sqlite3.connect(self.db_path)
-                backup.backup(conn)
-                conn.close()
-                return True
+            backup = sqlite3.connect(backup_path)
+            with self._lock:
+                backup.backup(self.conn)
+                self._user_cache.clear()
+            backup.close()
+            return True
         except Exception as e:
             print(f"Database restoration failed: {str(e)}")
             return False
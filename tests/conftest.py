@@ -0,0 +1,64 @@
+import os
+
+# 테스트에서는 bcrypt 최소 비용 사용 (config 임포트 전에 설정)
+os.environ.setdefault("MINDMAP_TEST_MODE", "true")
+
+import pytest
+import redis
+import fakeredis
+
+import storage.cache_manager as cache_manager
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_redis_server():
+    """CacheManager가 실제 Redis 대신 프로세스 내 fakeredis 서버를 사용하도록 설정"""
+    server = fakeredis.FakeServer()
+
+    def _fake_connection_pool(host, port, db, decode_responses):
+        return redis.ConnectionPool(
+            connection_class=fakeredis.FakeConnection,
+            server=server,
+            db=db,
+            decode_responses=decode_responses,
+            encoding='utf-8'
+        )
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cache_manager, "_get_connection_pool", _fake_connection_pool)
+        yield server
+
+
+@pytest.fixture(scope="session")
+def _system(fake_redis_server):
+    """시스템 컴포넌트 초기화 (세션당 한 번, 통합/부하 테스트 공유)"""
+    from modules.knowledge_map import KnowledgeMap
+    from modules.learning_analysis import LearningAnalysis
+    from modules.mistake_pattern import MistakePatternAnalysis
+    from storage.database import DatabaseManager
+    from storage.cache_manager import CacheManager
+
+    db = DatabaseManager(":memory:")
+    # 테스트 DB는 버려지므로 저널/동기화 비용 제거
+    for pragma in ("journal_mode=MEMORY", "synchronous=OFF", "locking_mode=EXCLUSIVE"):
+        db.conn.execute(f"PRAGMA {pragma}")
+
+    yield {
+        "db": db,
+        "cache": CacheManager(host="localhost", port=6379, db=0),
+        "knowledge_map": KnowledgeMap(),
+        "learning_analysis": LearningAnalysis(),
+        "mistake_analysis": MistakePatternAnalysis()
+    }
+    db.close()
+
+
+@pytest.fixture
+def system(_system):
+    """테스트별 격리 (DB는 SAVEPOINT 롤백, 캐시는 비움)"""
+    _system["db"].conn.execute("SAVEPOINT test_case")
+    yield _system
+    _system["db"].conn.execute("ROLLBACK TO test_case")
+    _system["db"].conn.execute("RELEASE test_case")
+    _system["cache"].redis_client.flushdb()
+    _system["knowledge_map"].G.clear()
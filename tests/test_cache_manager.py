@@ -0,0 +1,53 @@
+# File: tests/test_cache_manager.py
+# Unit Tests for Cache Manager
+
+import pytest
+import networkx as nx
+from datetime import date, datetime
+from storage.cache_manager import CacheManager
+
+class TestCacheManager:
+    @pytest.fixture
+    def cache(self):
+        """테스트용 CacheManager (fakeredis, 테스트마다 캐시 비움)"""
+        cache = CacheManager(host="localhost", port=6379, db=0)
+        yield cache
+        cache.redis_client.flushdb()
+
+    def test_knowledge_map_round_trip(self, cache):
+        """튜플 노드와 날짜 속성을 가진 지식맵 캐싱 테스트"""
+        G = nx.DiGraph()
+        G.add_node(("수학", "미분"), created=datetime(2024, 3, 1, 9, 30), due=date(2024, 3, 8))
+        G.add_node(("물리", "속도"), tags={"운동"})
+        G.add_edge(("수학", "미분"), ("물리", "속도"), reviewed=datetime(2024, 3, 2, 21, 0))
+
+        assert cache.cache_knowledge_map(1, G)
+        cached = cache.get_cached_knowledge_map(1)
+
+        assert isinstance(cached, nx.DiGraph)
+        assert dict(cached.nodes(data=True)) == dict(G.nodes(data=True))
+        assert list(cached.edges(data=True)) == list(G.edges(data=True))
+
+    def test_knowledge_map_parts(self, cache):
+        """노드/엣지 필드만 조회해도 원본과 같은 노드 집합 유지"""
+        G = nx.MultiGraph()
+        G.add_node(("수학", 1), subject="수학")
+        G.add_node(frozenset({"물리", "화학"}))
+        G.add_node(3)
+        G.add_edge(("수학", 1), 3, key="prereq")
+        G.add_edge(("수학", 1), frozenset({"물리", "화학"}))
+
+        assert cache.cache_knowledge_map(3, G)
+        nodes = cache.get_cached_knowledge_map(3, part="nodes")
+        edges = cache.get_cached_knowledge_map(3, part="edges")
+
+        assert {n for n, _ in nodes} == set(G.nodes)
+        assert {(u, v, k) for u, v, k, _ in edges} == set(G.edges(keys=True))
+
+    def test_knowledge_map_unsupported_value(self, cache):
+        """직렬화할 수 없는 속성은 문자열로 바꾸지 않고 캐싱 실패"""
+        G = nx.Graph()
+        G.add_node("미분", handler=object())
+
+        assert not cache.cache_knowledge_map(2, G)
+        assert cache.get_cached_knowledge_map(2) is None
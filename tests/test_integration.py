@@ -2,30 +2,21 @@
 # Integration Tests for MindMap Pro
 
 import pytest
+import time
 from datetime import datetime, timedelta
-from modules.knowledge_map import KnowledgeMap
-from modules.learning_analysis import LearningAnalysis
-from modules.mistake_pattern import MistakePatternAnalysis
-from storage.database import DatabaseManager
-from storage.cache_manager import CacheManager
 from modules.auth_manager import AuthManager
+from core.analysis import LearningAnalyzer
 
 class TestSystemIntegration:
+    @pytest.fixture(scope="session")
+    def _auth(self, _system):
+        """인증 관리자 (세션당 한 번)"""
+        return AuthManager(_system["db"], bcrypt_rounds=4)
+
     @pytest.fixture
-    def setup_system(self):
-        """시스템 컴포넌트 초기화"""
-        db = DatabaseManager(":memory:")  # 인메모리 데이터베이스 사용
-        cache = CacheManager(host="localhost", port=6379, db=0)
-        auth = AuthManager(db)
-        
-        return {
-            "db": db,
-            "cache": cache,
-            "auth": auth,
-            "knowledge_map": KnowledgeMap(),
-            "learning_analysis": LearningAnalysis(),
-            "mistake_analysis": MistakePatternAnalysis()
-        }
+    def setup_system(self, system, _auth):
+        """공유 시스템 컴포넌트 + 인증 관리자"""
+        return {**system, "auth": _auth}
 
     def test_user_workflow(self, setup_system):
         """전체 사용자 워크플로우 테스트"""
@@ -65,7 +56,7 @@ class TestSystemIntegration:
         assert record_id is not None
         
         # 4. 학습 분석 실행
-        analysis = system["learning_analysis"].analyze_study_patterns(
+        analysis = LearningAnalyzer(system["db"]).analyze_study_patterns(
             user_data["user_id"]
         )
         assert analysis is not None
@@ -156,30 +147,23 @@ class TestSystemIntegration:
         system = setup_system
         
         # 1. 대량 데이터 처리
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         user_data = system["auth"].register(
             username="perftest",
             password="Test@123"
         )
         
-        # 100개의 학습 기록 생성
-        for i in range(100):
-            system["db"].add_study_record(
-                user_data["user_id"],
-                subject="수학",
-                study_time=60,
-                score=90,
-                stress_level=3
-            )
+        # 100개의 학습 기록을 한 번에 생성
+        records = [(user_data["user_id"], "수학", 60, 90, 3)] * 100
+        system["db"].add_study_records_bulk(records)
         
         # 분석 실행
-        analysis = system["learning_analysis"].analyze_study_patterns(
+        analysis = LearningAnalyzer(system["db"]).analyze_study_patterns(
             user_data["user_id"]
         )
         
-        end_time = datetime.now()
-        execution_time = (end_time - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
-        # 실행 시간이 5초를 넘지 않아야 함
-        assert execution_time < 5
+        # 실행 시간이 1초를 넘지 않아야 함
+        assert execution_time < 1
@@ -2,6 +2,7 @@
 # Unit Tests for Knowledge Map Module
 
 import pytest
+import streamlit as st
 from modules.knowledge_map import KnowledgeMap
 import networkx as nx
 import pandas as pd
@@ -11,10 +12,11 @@ class TestKnowledgeMap:
     @pytest.fixture
     def knowledge_map(self):
         """테스트용 KnowledgeMap 인스턴스 생성"""
+        st.session_state.pop('knowledge_map_graph', None)
         return KnowledgeMap()
 
-    @pytest.fixture
-    def sample_graph(self):
+    @staticmethod
+    def _build_sample_graph():
         """테스트용 그래프 데이터 생성"""
         G = nx.Graph()
         G.add_node("미분", subject="수학")
@@ -24,6 +26,16 @@ class TestKnowledgeMap:
         G.add_edge("미분", "적분")
         return G
 
+    @pytest.fixture
+    def sample_graph(self):
+        """테스트용 그래프 데이터 생성"""
+        return self._build_sample_graph()
+
+    @pytest.fixture(scope="module")
+    def centrality(self):
+        """샘플 그래프의 연결 중심성 (모듈당 한 번 계산)"""
+        return nx.degree_centrality(self._build_sample_graph())
+
     def test_create_new_map(self, knowledge_map):
         """새로운 지식맵 생성 테스트"""
         # 새로운 개념 추가
@@ -60,25 +72,21 @@ class TestKnowledgeMap:
         assert fig is not None
         mock_figure.assert_called_once
 
-    def test_graph_metrics(self, knowledge_map, sample_graph):
+    def test_graph_metrics(self, centrality):
         """그래프 메트릭스 계산 테스트"""
-        knowledge_map.G = sample_graph
-        
-        # 중심성 계산
-        centrality = nx.degree_centrality(knowledge_map.G)
         assert centrality["미분"] > centrality["속도"]  # 미분이 더 많은 연결을 가짐
 
     def test_subject_filtering(self, knowledge_map, sample_graph):
         """과목별 필터링 테스트"""
         knowledge_map.G = sample_graph
         
-        math_nodes = [n for n, d in knowledge_map.G.nodes(data=True) 
-                     if d["subject"] == "수학"]
-        assert len(math_nodes) == 2  # 미분, 적분
+        # 한 번의 순회로 과목별 노드 분류
+        by_subject = {}
+        for n, d in knowledge_map.G.nodes(data=True):
+            by_subject.setdefault(d["subject"], []).append(n)
         
-        physics_nodes = [n for n, d in knowledge_map.G.nodes(data=True) 
-                        if d["subject"] == "물리"]
-        assert len(physics_nodes) == 1  # 속도
+        assert len(by_subject["수학"]) == 2  # 미분, 적분
+        assert len(by_subject["물리"]) == 1  # 속도
 
     def test_edge_attributes(self, knowledge_map):
         """엣지 속성 테스트"""
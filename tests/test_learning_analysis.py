@@ -14,24 +14,36 @@ class TestLearningAnalysis:
         """학습 분석기 인스턴스 생성"""
         return LearningAnalysis()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_study_data(self):
-        """테스트용 학습 데이터 생성"""
+        """테스트용 학습 데이터 생성 (모듈당 한 번, 테스트에서 변경하지 않음)"""
+        rng = np.random.RandomState(42)
         dates = pd.date_range(start='2024-01-01', end='2024-01-31', freq='D')
         subjects = ['수학', '물리', '화학', '영어', '국어']
         data = []
         
         for date in dates:
             for subject in subjects:
+                stress_level = rng.randint(1, 6)
                 data.append({
                     'date': date,
                     'subject': subject,
-                    'study_time': np.random.randint(30, 180),
-                    'score': np.random.randint(70, 100),
-                    'stress_level': np.random.randint(1, 6)
+                    'study_time': rng.randint(30, 180),
+                    # 스트레스가 높을수록 점수가 낮아지도록 (70~96점)
+                    'score': 100 - stress_level * 4 - rng.randint(0, 10),
+                    'stress_level': stress_level
                 })
         
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data)
+        df['subject'] = pd.Categorical(df['subject'], categories=subjects)
+        df['week'] = df['date'].dt.isocalendar().week.astype('int16')
+        return df
+
+    @pytest.fixture(scope="module")
+    def stress_corr(self, sample_study_data):
+        """스트레스 레벨별 평균 점수와 스트레스 레벨의 상관계수"""
+        stress_scores = sample_study_data.groupby('stress_level')['score'].mean()
+        return stress_scores.corr(pd.Series(range(1, 6), index=range(1, 6)))
 
     def test_time_distribution_analysis(self, learning_analyzer, sample_study_data):
         """시간 분포 분석 테스트"""
@@ -41,7 +53,7 @@ class TestLearningAnalysis:
         learning_analyzer.render_time_distribution()
         
         # 과목별 총 학습 시간 확인
-        subject_times = sample_study_data.groupby('subject')['study_time'].sum()
+        subject_times = sample_study_data.groupby('subject', sort=False, observed=True)['study_time'].sum()
         assert len(subject_times) == 5  # 5개 과목
         assert all(subject_times > 0)  # 모든 과목의 학습 시간이 0보다 큼
 
@@ -53,7 +65,7 @@ class TestLearningAnalysis:
         learning_analyzer.render_performance_analysis()
         
         # 과목별 평균 점수 확인
-        subject_scores = sample_study_data.groupby('subject')['score'].mean()
+        subject_scores = sample_study_data.groupby('subject', sort=False, observed=True)['score'].mean()
         assert all(subject_scores >= 70)  # 모든 과목의 평균 점수가 70점 이상
         assert all(subject_scores <= 100)  # 모든 과목의 평균 점수가 100점 이하
 
@@ -80,13 +92,10 @@ class TestLearningAnalysis:
         best_date = time_scores.idxmax()
         assert isinstance(best_date, pd.Timestamp)
 
-    def test_stress_impact_analysis(self, learning_analyzer, sample_study_data):
+    def test_stress_impact_analysis(self, learning_analyzer, stress_corr):
         """스트레스 영향 분석 테스트"""
-        # 스트레스 레벨과 성적의 상관관계 분석
-        stress_correlation = sample_study_data.groupby('stress_level')['score'].mean()
-        
         # 일반적으로 스트레스가 높을수록 성적이 낮아지는 경향
-        assert stress_correlation.corr(pd.Series(range(1, 6))) < 0
+        assert stress_corr < 0
 
     def test_subject_correlation(self, learning_analyzer, sample_study_data):
         """과목 간 상관관계 분석 테스트"""
@@ -95,7 +104,8 @@ class TestLearningAnalysis:
             sample_study_data,
             values='score',
             index='date',
-            columns='subject'
+            columns='subject',
+            observed=True
         )
         
         # 상관관계 행렬 계산
@@ -108,8 +118,8 @@ class TestLearningAnalysis:
     def test_learning_pattern_detection(self, learning_analyzer, sample_study_data):
         """학습 패턴 감지 테스트"""
         # 요일별 학습 성과 분석
-        sample_study_data['weekday'] = sample_study_data['date'].dt.day_name()
-        weekday_scores = sample_study_data.groupby('weekday')['score'].mean()
+        data = sample_study_data.assign(weekday=sample_study_data['date'].dt.day_name())
+        weekday_scores = data.groupby('weekday')['score'].mean()
         
         # 모든 요일의 평균 점수가 유효한 범위 내인지 확인
         assert weekday_scores.min() >= 0
@@ -133,8 +143,7 @@ class TestLearningAnalysis:
     def test_trend_analysis(self, learning_analyzer, sample_study_data):
         """추세 분석 테스트"""
         # 주간 평균 점수 계산
-        sample_study_data['week'] = sample_study_data['date'].dt.isocalendar().week
-        weekly_scores = sample_study_data.groupby('week')['score'].mean()
+        weekly_scores = sample_study_data.groupby('week', sort=False)['score'].mean()
         
         # 추세선 기울기 계산
         x = np.arange(len(weekly_scores))
@@ -2,6 +2,7 @@
 # Mistake Pattern Analysis Tests
 
 import pytest
+import time
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,9 +14,10 @@ class TestMistakePatternAnalysis:
         """실수 패턴 분석기 인스턴스 생성"""
         return MistakePatternAnalysis()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_mistake_data(self):
-        """테스트용 실수 데이터 생성"""
+        """테스트용 실수 데이터 생성 (모듈당 한 번, 테스트에서 변경하지 않음)"""
+        rng = np.random.RandomState(0)
         dates = pd.date_range(start='2024-01-01', end='2024-01-31', freq='D')
         mistake_types = [
             '계산 실수',
@@ -26,24 +28,30 @@ class TestMistakePatternAnalysis:
         ]
         subjects = ['수학', '물리', '화학', '영어', '국어']
         
-        data = []
-        for date in dates:
-            for subject in subjects:
-                # 각 과목별로 1-3개의 실수 생성
-                for _ in range(np.random.randint(1, 4)):
-                    data.append({
-                        'date': date,
-                        'subject': subject,
-                        'mistake_type': np.random.choice(mistake_types),
-                        'problem_difficulty': np.random.choice(['상', '중', '하']),
-                        'time_spent': np.random.randint(1, 10),
-                        'is_repeated': np.random.choice([True, False]),
-                        'stress_level': np.random.randint(1, 6)
-                    })
-        
-        return pd.DataFrame(data)
-
-    def test_pattern_overview_analysis(self, pattern_analyzer, sample_mistake_data):
+        # 각 날짜/과목별로 1-3개의 실수를 열 단위로 한 번에 생성
+        counts = rng.randint(1, 4, size=(len(dates), len(subjects)))
+        total = counts.sum()
+        
+        return pd.DataFrame({
+            'date': np.repeat(dates.values, counts.sum(axis=1)),
+            'subject': np.repeat(np.tile(subjects, len(dates)), counts.ravel()),
+            'mistake_type': rng.choice(mistake_types, total),
+            'problem_difficulty': rng.choice(['상', '중', '하'], total),
+            'time_spent': rng.randint(1, 10, size=total),
+            'is_repeated': rng.choice([True, False], total),
+            'stress_level': rng.randint(1, 6, size=total)
+        })
+
+    @pytest.fixture(scope="module")
+    def subj_mistake_ct(self, sample_mistake_data):
+        """과목 x 실수 유형 교차표 (모듈 내 테스트 공유)"""
+        return pd.crosstab(
+            sample_mistake_data['subject'],
+            sample_mistake_data['mistake_type']
+        )
+
+    def test_pattern_overview_analysis(self, pattern_analyzer, sample_mistake_data,
+                                       subj_mistake_ct):
         """실수 패턴 개요 분석 테스트"""
         pattern_analyzer.mistake_data = sample_mistake_data
         
@@ -51,12 +59,8 @@ class TestMistakePatternAnalysis:
         pattern_analyzer.render_pattern_overview()
         
         # 과목별, 실수 유형별 분포 확인
-        mistake_distribution = pd.crosstab(
-            sample_mistake_data['subject'],
-            sample_mistake_data['mistake_type']
-        )
-        assert not mistake_distribution.empty
-        assert mistake_distribution.values.sum() > 0
+        assert not subj_mistake_ct.empty
+        assert subj_mistake_ct.values.sum() > 0
 
     def test_trend_analysis(self, pattern_analyzer, sample_mistake_data):
         """실수 추세 분석 테스트"""
@@ -122,19 +126,15 @@ class TestMistakePatternAnalysis:
     def test_time_pressure_analysis(self, pattern_analyzer, sample_mistake_data):
         """시간 압박 관련 실수 분석 테스트"""
         # 시간 부족으로 인한 실수 비율 계산
-        time_pressure_ratio = len(
-            sample_mistake_data[sample_mistake_data['mistake_type'] == '시간 부족']
-        ) / len(sample_mistake_data)
+        time_pressure_ratio = (
+            sample_mistake_data['mistake_type'].values == '시간 부족'
+        ).mean()
         assert 0 <= time_pressure_ratio <= 1
 
-    def test_subject_specific_patterns(self, pattern_analyzer, sample_mistake_data):
+    def test_subject_specific_patterns(self, pattern_analyzer, subj_mistake_ct):
         """과목별 특징적 실수 패턴 분석 테스트"""
         # 과목별 주요 실수 유형 확인
-        subject_patterns = pd.crosstab(
-            sample_mistake_data['subject'],
-            sample_mistake_data['mistake_type']
-        )
-        assert subject_patterns.shape == (5, 5)  # 5개 과목, 5개 실수 유형
+        assert subj_mistake_ct.shape == (5, 5)  # 5개 과목, 5개 실수 유형
 
     def test_data_validation(self, pattern_analyzer):
         """데이터 유효성 검증 테스트"""
@@ -156,12 +156,12 @@ class TestMistakePatternAnalysis:
     def test_improvement_tracking(self, pattern_analyzer, sample_mistake_data):
         """개선 추적 테스트"""
         # 시간에 따른 실수 개선도 분석
-        sample_mistake_data.sort_values('date', inplace=True)
+        data = sample_mistake_data.sort_values('date')
         
         # 전반부와 후반부 실수 빈도 비교
-        mid_point = len(sample_mistake_data) // 2
-        early_mistakes = len(sample_mistake_data[:mid_point])
-        later_mistakes = len(sample_mistake_data[mid_point:])
+        mid_point = len(data) // 2
+        early_mistakes = len(data[:mid_point])
+        later_mistakes = len(data[mid_point:])
         
         # 일반적으로 시간이 지날수록 실수가 줄어들어야 함
         improvement_ratio = later_mistakes / early_mistakes
@@ -193,10 +193,12 @@ class TestMistakePatternAnalysis:
     def test_pattern_seasonality(self, pattern_analyzer, sample_mistake_data):
         """실수 패턴의 계절성 테스트"""
         # 요일별 실수 패턴 분석
-        sample_mistake_data['weekday'] = pd.to_datetime(sample_mistake_data['date']).dt.day_name()
+        data = sample_mistake_data.assign(
+            weekday=sample_mistake_data['date'].dt.day_name()
+        )
         weekday_patterns = pd.crosstab(
-            sample_mistake_data['weekday'],
-            sample_mistake_data['mistake_type']
+            data['weekday'],
+            data['mistake_type']
         )
         
         # 모든 요일에 실수 데이터가 존재하는지 확인
@@ -204,7 +206,7 @@ class TestMistakePatternAnalysis:
 
     def test_performance_metrics(self, pattern_analyzer, sample_mistake_data):
         """성능 지표 분석 테스트"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         # 분석 실행
         pattern_analyzer.mistake_data = sample_mistake_data
@@ -213,8 +215,7 @@ class TestMistakePatternAnalysis:
         pattern_analyzer.render_correlation_analysis()
         pattern_analyzer.render_improvement_suggestions()
         
-        end_time = datetime.now()
-        execution_time = (end_time - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
         # 전체 분석이 2초 이내에 완료되어야 함
         assert execution_time < 2.0
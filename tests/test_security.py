@@ -2,25 +2,26 @@
 # Security Tests for MindMap Pro
 
 import pytest
+import time
 import jwt
 import bcrypt
 from datetime import datetime, timedelta
 from modules.auth_manager import AuthManager
-from storage.database import DatabaseManager
-from storage.cache_manager import CacheManager
 
 class TestSecurity:
+    @pytest.fixture(scope="session")
+    def _auth(self, _system):
+        """보안 테스트용 인증 관리자 (세션당 한 번)"""
+        return AuthManager(_system["db"], secret_key="test_secret_key_for_security",
+                           bcrypt_rounds=4, cache_manager=_system["cache"])
+
     @pytest.fixture
-    def setup_security(self):
-        """보안 테스트를 위한 환경 설정"""
-        db = DatabaseManager(":memory:")
-        cache = CacheManager(host="localhost", port=6379, db=0)
-        auth = AuthManager(db, secret_key="test_secret_key_for_security")
-        
+    def setup_security(self, system, _auth):
+        """보안 테스트를 위한 환경 설정 (DB는 SAVEPOINT 롤백, 캐시는 비움)"""
         return {
-            "db": db,
-            "cache": cache,
-            "auth": auth
+            "db": system["db"],
+            "cache": system["cache"],
+            "auth": _auth
         }
 
     def test_password_security(self, setup_security):
@@ -50,6 +51,12 @@ class TestSecurity:
             is_valid, _ = auth.validate_password_strength(weak_pass)
             assert not is_valid
 
+        # 비ASCII 대소문자/숫자도 문자 종류로 인정
+        for unicode_pass in ["ÄÖÜäöü1!", "Пароль12!"]:
+            is_valid, _ = auth.validate_password_strength(unicode_pass)
+            assert is_valid
+        assert not auth.validate_password_strength("äöüßäöü1!")[0]  # 대문자 없음
+
     def test_token_security(self, setup_security):
         """토큰 보안 테스트"""
         auth = setup_security["auth"]
@@ -77,6 +84,17 @@ class TestSecurity:
         )
         assert auth.verify_token(expired_token) is None
 
+        # 캐시 유지 시간(30초) 안이라도 exp가 지나면 캐시된 토큰도 거부
+        exp = int(time.time()) + 1
+        short_token = jwt.encode(
+            {"user_id": user_id, "type": "access", "exp": exp},
+            auth.secret_key,
+            algorithm="HS256"
+        )
+        assert auth.verify_token(short_token) is not None
+        time.sleep(max(0, exp - time.time()) + 0.05)
+        assert auth.verify_token(short_token) is None
+
     def test_session_security(self, setup_security):
         """세션 보안 테스트"""
         auth = setup_security["auth"]
@@ -90,8 +108,9 @@ class TestSecurity:
             "user_agent": "test_browser"
         }
         
-        # 세션 데이터 암호화 저장
-        cache.set_user_data(user_id, session_data, expire_time=3600)
+        # 세션 데이터 암호화 저장 (파이프라인으로 한 번에 전송)
+        with cache.pipeline() as pipe:
+            cache.set_user_data(user_id, session_data, expire_time=3600, pipe=pipe)
         
         # 세션 데이터 검증
         retrieved_data = cache.get_user_data(user_id)
@@ -111,11 +130,11 @@ class TestSecurity:
             "stress_level": 3
         }
         
-        # 데이터 암호화 저장
-        record_id = db.add_study_record(**sensitive_data)
+        # 데이터 암호화 저장 (저장된 행을 그대로 반환받아 검증)
+        retrieved_data = db.add_study_record(**sensitive_data)
         
         # 저장된 데이터 검증
-        retrieved_data = db.get_study_statistics(1)[0]
+        assert retrieved_data["record_id"] is not None
         assert retrieved_data["subject"] == sensitive_data["subject"]
         assert retrieved_data["score"] == sensitive_data["score"]
 
@@ -165,7 +184,7 @@ class TestSecurity:
         
         for _ in range(10):
             try:
-                auth.login("test_user", "wrong_password")
+                auth.login("test_user", "wrong_password", ip_address=ip_address)
                 attempt_count += 1
             except Exception as e:
                 if "rate limit exceeded" in str(e).lower():
@@ -173,6 +192,19 @@ class TestSecurity:
                     
         assert attempt_count < 10  # 일정 횟수 이상 시도하면 제한되어야 함
 
+        # 카운터 키에는 항상 윈도우 TTL이 설정되어야 함
+        ttl = cache.redis_client.ttl(cache._get_key("rate_limit:login", ip_address))
+        assert 0 < ttl <= 60
+
+        # 성공한 로그인은 한도를 소모하지 않음
+        auth.register("rate_user", "SecureP@ssw0rd123")
+        for _ in range(10):
+            assert auth.login("rate_user", "SecureP@ssw0rd123", ip_address="10.0.0.1")
+
+        # IP 없이 사용자명만으로는 제한하지 않음 (계정 잠금 공격 방지)
+        for _ in range(10):
+            assert auth.login("test_user", "wrong_password") is None
+
     def test_secure_communication(self, setup_security):
         """보안 통신 테스트"""
         auth = setup_security["auth"]
@@ -1,45 +1,76 @@
 # File: tools/data_migration.py
 # Data Migration Tool for MindMap Pro
 
-import json
+import os
 import csv
-from typing import Dict, List, Any
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from collections import defaultdict
+from itertools import chain
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Any
+import time
 import logging
 from pathlib import Path
 from storage.database import DatabaseManager
 
+# 내보내기 파일명/메타데이터 타임스탬프 형식
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# CSV 내보내기 쓰기 버퍼 크기 (1MB)
+CSV_BUFFER_SIZE = 1 << 20
+
+# 내보내기 파일 직렬화 옵션 (numpy 값과 정수 키 허용)
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _dumps(data: Any) -> bytes:
+    """JSON 직렬화 (UTF-8 bytes)"""
+    return orjson.dumps(data, option=_ORJSON_OPTIONS)
+
 class DataMigrationTool:
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, backup_dir: Optional[Path] = None):
         self.db = db_manager
         self.logger = logging.getLogger(__name__)
-        self.backup_dir = Path("backups")
-        self.backup_dir.mkdir(exist_ok=True)
+        self._ensured_dirs: Set[Path] = set()
+        self.backup_dir = self._ensure_dir(Path(backup_dir) if backup_dir else Path("backups"))
+        
+    def _ensure_dir(self, path: Path) -> Path:
+        """디렉터리 생성 (이미 확인한 경로는 다시 mkdir하지 않음)"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+        return path
         
-    def export_user_data(self, user_id: int, output_dir: str = None) -> Dict[str, Any]:
-        """사용자 데이터 내보내기"""
+    def export_user_data(self, user_id: int, output_dir: str = None,
+                         timestamp: str = None) -> Dict[str, Any]:
+        """사용자 데이터 내보내기 (timestamp가 없으면 현재 시각 사용)"""
         try:
-            if output_dir:
-                output_path = Path(output_dir)
-                output_path.mkdir(exist_ok=True)
-            else:
-                output_path = self.backup_dir
+            output_path = self._ensure_dir(Path(output_dir)) if output_dir else self.backup_dir
                 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if timestamp is None:
+                timestamp = time.strftime(TIMESTAMP_FORMAT)
             filename = output_path / f"user_{user_id}_data_{timestamp}.json"
             
-            # 사용자 데이터 수집
-            data = {
-                "user_info": self.db.get_user_by_id(user_id),
-                "knowledge_maps": self._export_knowledge_maps(user_id),
-                "study_records": self._export_study_records(user_id),
-                "mistake_records": self._export_mistake_records(user_id),
-                "export_timestamp": timestamp
-            }
-            
-            # JSON 파일로 저장
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 레코드 단위로 임시 파일에 바로 기록 후 원자적으로 교체 (전체 데이터를 메모리에 모으지 않음)
+            tmp_filename = filename.with_name(filename.name + ".tmp")
+            try:
+                with open(tmp_filename, 'wb') as f:
+                    f.write(b'{"user_info":')
+                    f.write(_dumps(self.db.get_user_by_id(user_id)))
+                    f.write(b',"knowledge_maps":')
+                    self._write_json_array(f, self._export_knowledge_maps(user_id))
+                    f.write(b',"study_records":')
+                    self._write_json_array(f, self._export_study_records(user_id))
+                    f.write(b',"mistake_records":')
+                    self._write_json_array(f, self._export_mistake_records(user_id))
+                    f.write(b',"export_timestamp":')
+                    f.write(_dumps(timestamp))
+                    f.write(b'}')
+                os.replace(tmp_filename, filename)
+            except Exception:
+                # 불완전한 백업 파일은 남기지 않음
+                tmp_filename.unlink(missing_ok=True)
+                raise
                 
             self.logger.info(f"Successfully exported data for user {user_id} to {filename}")
             return {"success": True, "filename": str(filename)}
@@ -48,21 +79,56 @@ class DataMigrationTool:
             self.logger.error(f"Error exporting user data: {str(e)}")
             return {"success": False, "error": str(e)}
             
-    def import_user_data(self, filepath: str) -> Dict[str, Any]:
-        """사용자 데이터 가져오기"""
+    def export_users(self, user_ids: List[int], output_dir: str = None,
+                     workers: int = 8) -> Dict[int, Dict[str, Any]]:
+        """여러 사용자 데이터를 스레드 풀로 병렬 내보내기 (스레드별 DB 연결 사용)"""
+        # 배치 전체가 같은 타임스탬프 사용 (파일명은 user_id로 구분하므로
+        # 중복 user_id는 같은 .tmp 파일을 동시에 쓰지 않도록 미리 제거)
+        user_ids = list(dict.fromkeys(user_ids))
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
+        local = threading.local()
+        worker_dbs: List[DatabaseManager] = []
+        worker_dbs_lock = threading.Lock()
+
+        def export_one(user_id: int) -> Dict[str, Any]:
+            tool = getattr(local, "tool", None)
+            if tool is None:
+                # 인메모리 DB는 다른 연결에서 열 수 없으므로 기존 연결을 공유
+                if self.db.db_path == ":memory:":
+                    tool = self
+                else:
+                    db = DatabaseManager(self.db.db_path)
+                    with worker_dbs_lock:
+                        worker_dbs.append(db)
+                    # 작업 디렉터리에 backups를 새로 만들지 않도록 부모의 백업 경로 전달
+                    tool = DataMigrationTool(db, backup_dir=self.backup_dir)
+                local.tool = tool
+            return tool.export_user_data(user_id, output_dir, timestamp)
+
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(zip(user_ids, executor.map(export_one, user_ids)))
+        finally:
+            for db in worker_dbs:
+                db.close()
+
+    def import_user_data(self, filepath: str, backup: bool = True) -> Dict[str, Any]:
+        """사용자 데이터 가져오기 (backup=False이면 기존 데이터 백업 생략)"""
+        try:
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
                 
             user_id = data["user_info"]["user_id"]
             
             # 기존 데이터 백업
-            self.export_user_data(user_id)
+            if backup:
+                self.export_user_data(user_id)
             
-            # 데이터 가져오기
-            self._import_knowledge_maps(user_id, data["knowledge_maps"])
-            self._import_study_records(user_id, data["study_records"])
-            self._import_mistake_records(user_id, data["mistake_records"])
+            # 데이터 가져오기 (전체를 하나의 트랜잭션으로 처리, 실패 시 모두 롤백)
+            with self.db.transaction():
+                self._import_knowledge_maps(user_id, data["knowledge_maps"])
+                self._import_study_records(user_id, data["study_records"])
+                self._import_mistake_records(user_id, data["mistake_records"])
             
             self.logger.info(f"Successfully imported data for user {user_id}")
             return {"success": True, "user_id": user_id}
@@ -71,25 +137,41 @@ class DataMigrationTool:
             self.logger.error(f"Error importing user data: {str(e)}")
             return {"success": False, "error": str(e)}
             
-    def _export_knowledge_maps(self, user_id: int) -> List[Dict]:
-        """지식맵 데이터 내보내기"""
-        maps = self.db.get_user_knowledge_maps(user_id)
-        for map_data in maps:
+    @staticmethod
+    def _write_json_array(f: BinaryIO, items: Iterable[Any]):
+        """항목을 하나씩 직렬화하여 JSON 배열로 기록"""
+        f.write(b'[')
+        for i, item in enumerate(items):
+            if i:
+                f.write(b',')
+            f.write(_dumps(item))
+        f.write(b']')
+
+    def _export_knowledge_maps(self, user_id: int) -> Iterator[Dict]:
+        """지식맵 데이터 내보내기 (노드/엣지는 사용자 단위로 한 번에 조회 후 지식맵별 분배)"""
+        nodes_by_map: Dict[int, List[Dict]] = defaultdict(list)
+        for node in self.db.get_nodes_for_user(user_id):
+            nodes_by_map[node["map_id"]].append(node)
+        edges_by_map: Dict[int, List[Dict]] = defaultdict(list)
+        for edge in self.db.get_edges_for_user(user_id):
+            edges_by_map[edge["map_id"]].append(edge)
+            
+        for map_data in self.db.get_user_knowledge_maps(user_id):
             map_id = map_data["map_id"]
-            map_data["nodes"] = self.db.get_map_nodes(map_id)
-            map_data["edges"] = self.db.get_map_edges(map_id)
-        return maps
+            map_data["nodes"] = nodes_by_map.pop(map_id, [])
+            map_data["edges"] = edges_by_map.pop(map_id, [])
+            yield map_data
         
-    def _export_study_records(self, user_id: int) -> List[Dict]:
+    def _export_study_records(self, user_id: int) -> Iterator[Dict]:
         """학습 기록 내보내기"""
-        return self.db.get_study_records(user_id)
+        return self.db.iter_study_records(user_id)
         
-    def _export_mistake_records(self, user_id: int) -> List[Dict]:
+    def _export_mistake_records(self, user_id: int) -> Iterator[Dict]:
         """실수 기록 내보내기"""
-        return self.db.get_mistake_records(user_id)
+        return self.db.iter_mistake_records(user_id)
         
     def _import_knowledge_maps(self, user_id: int, maps: List[Dict]):
-        """지식맵 데이터 가져오기"""
+        """지식맵 데이터 가져오기 (지식맵별 노드/엣지 일괄 추가)"""
         for map_data in maps:
             map_id = self.db.add_knowledge_map(
                 user_id,
@@ -97,41 +179,45 @@ class DataMigrationTool:
             )
             
             # 노드 추가
-            node_id_mapping = {}
-            for node in map_data["nodes"]:
-                new_node_id = self.db.add_concept_node(
-                    map_id,
-                    node["concept"],
-                    node["subject"],
-                    node["level"]
-                )
-                node_id_mapping[node["node_id"]] = new_node_id
+            nodes = map_data["nodes"]
+            new_node_ids = self.db.add_concept_nodes_bulk(
+                map_id,
+                ((node["concept"], node["subject"], node["level"]) for node in nodes)
+            )
+            node_id_mapping = {
+                node["node_id"]: new_node_id
+                for node, new_node_id in zip(nodes, new_node_ids)
+            }
                 
             # 엣지 추가
-            for edge in map_data["edges"]:
-                self.db.add_concept_edge(
+            self.db.add_concept_edges_bulk(
+                (
                     map_id,
                     node_id_mapping[edge["source_node_id"]],
                     node_id_mapping[edge["target_node_id"]],
                     edge["relationship_type"],
                     edge["strength"]
                 )
+                for edge in map_data["edges"]
+            )
                 
     def _import_study_records(self, user_id: int, records: List[Dict]):
-        """학습 기록 가져오기"""
-        for record in records:
-            self.db.add_study_record(
+        """학습 기록 가져오기 (하나의 트랜잭션으로 일괄 추가)"""
+        self.db.add_study_records_bulk(
+            (
                 user_id,
                 record["subject"],
                 record["study_time"],
                 record["score"],
                 record["stress_level"]
             )
+            for record in records
+        )
             
     def _import_mistake_records(self, user_id: int, records: List[Dict]):
-        """실수 기록 가져오기"""
-        for record in records:
-            self.db.add_mistake_record(
+        """실수 기록 가져오기 (하나의 트랜잭션으로 일괄 추가)"""
+        self.db.add_mistake_records_bulk(
+            (
                 user_id,
                 record["subject"],
                 record["mistake_type"],
@@ -140,31 +226,34 @@ class DataMigrationTool:
                 record["is_repeated"],
                 record["stress_level"]
             )
+            for record in records
+        )
             
-    def export_to_csv(self, user_id: int, data_type: str, output_dir: str = None) -> Dict[str, Any]:
-        """데이터를 CSV 형식으로 내보내기"""
+    def export_to_csv(self, user_id: int, data_type: str, output_dir: str = None,
+                      timestamp: str = None) -> Dict[str, Any]:
+        """데이터를 CSV 형식으로 내보내기 (timestamp가 없으면 현재 시각 사용)"""
         try:
-            if output_dir:
-                output_path = Path(output_dir)
-                output_path.mkdir(exist_ok=True)
-            else:
-                output_path = self.backup_dir
+            output_path = self._ensure_dir(Path(output_dir)) if output_dir else self.backup_dir
                 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if timestamp is None:
+                timestamp = time.strftime(TIMESTAMP_FORMAT)
             filename = output_path / f"user_{user_id}_{data_type}_{timestamp}.csv"
             
             if data_type == "study_records":
-                data = self._export_study_records(user_id)
+                records = self._export_study_records(user_id)
             elif data_type == "mistake_records":
-                data = self._export_mistake_records(user_id)
+                records = self._export_mistake_records(user_id)
             else:
                 raise ValueError(f"Unsupported data type: {data_type}")
                 
-            if data:
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=data[0].keys())
+            # 첫 행으로 컬럼을 정한 뒤 나머지는 스트리밍으로 기록
+            first = next(records, None)
+            if first is not None:
+                with open(filename, 'w', newline='', encoding='utf-8',
+                          buffering=CSV_BUFFER_SIZE) as f:
+                    writer = csv.DictWriter(f, fieldnames=first.keys())
                     writer.writeheader()
-                    writer.writerows(data)
+                    writer.writerows(chain((first,), records))
                     
                 return {"success": True, "filename": str(filename)}
             return {"success": False, "error": "No data found"}